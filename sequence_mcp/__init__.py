@@ -4,8 +4,11 @@ from .client import SequenceClient
 from .models import (
     Account,
     AccountBalance,
+    AccountBalanceData,
+    AccountData,
     AccountsResponse,
     TriggerRuleResponse,
+    TriggerSpec,
     SequenceError,
 )
 
@@ -13,7 +16,10 @@ __all__ = [
     "SequenceClient",
     "Account",
     "AccountBalance",
+    "AccountBalanceData",
+    "AccountData",
     "AccountsResponse",
     "TriggerRuleResponse",
+    "TriggerSpec",
     "SequenceError",
 ]
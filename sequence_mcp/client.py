@@ -1,16 +1,37 @@
 """Async client for the Sequence Banking API."""
 
-from typing import Any
+import asyncio
+import functools
+from typing import Any, NoReturn
 import httpx
+import orjson
 
 from .models import (
+    _ACCOUNTS_ADAPTER,
+    _ACCOUNTS_VALIDATOR,
+    _TRIGGER_VALIDATOR,
     Account,
-    AccountsResponse,
+    AccountData,
     TriggerRuleResponse,
+    TriggerSpec,
     SequenceError,
 )
 
 
+@functools.lru_cache(maxsize=32)
+def _signature_headers(api_secret: str) -> dict[str, str]:
+    """Build the headers for a rule trigger, cached per API secret.
+
+    The returned dict is shared between calls and must not be mutated.
+    Like the access token header, the secret keeps the `Bearer` prefix that
+    the Sequence API documents for its custom auth headers.
+    """
+    return {
+        "x-sequence-signature": f"Bearer {api_secret}",
+        "Content-Type": "application/json",
+    }
+
+
 class SequenceClient:
     """Async client for interacting with the Sequence Banking API.
 
@@ -19,56 +40,144 @@ class SequenceClient:
     - API secret: For rule triggers (per-rule secrets)
     """
 
+    __slots__ = (
+        "_access_token",
+        "_accounts_headers",
+        "timeout",
+        "limits",
+        "transport",
+        "_client",
+        "_owns_client",
+    )
+
     BASE_URL = "https://api.getsequence.io"
 
+    # Request body for endpoints that take no parameters, serialized once
+    _EMPTY_JSON = b"{}"
+
+    # Sized for bursts of concurrent rule triggers; httpx defaults to 100/20.
+    # Idle connections are dropped before typical server-side keep-alive
+    # timeouts, so a request is not sent on a connection the API is about to close.
+    DEFAULT_LIMITS = httpx.Limits(
+        max_connections=1000,
+        max_keepalive_connections=100,
+        keepalive_expiry=15.0,
+    )
+
     def __init__(
         self,
         access_token: str | None = None,
         timeout: float = 30.0,
+        http_client: httpx.AsyncClient | None = None,
+        max_connections: int = DEFAULT_LIMITS.max_connections,
+        max_keepalive_connections: int = DEFAULT_LIMITS.max_keepalive_connections,
+        keepalive_expiry: float = DEFAULT_LIMITS.keepalive_expiry,
+        transport: httpx.AsyncBaseTransport | None = None,
     ):
         """Initialize the Sequence client.
 
         Args:
             access_token: User access token for account operations.
             timeout: Request timeout in seconds.
+            http_client: Optional shared HTTP client (see `create_http_client`).
+                Its connection pool is reused and it is left open on close.
+            max_connections: Maximum number of concurrent connections.
+            max_keepalive_connections: Maximum number of idle connections kept open.
+            keepalive_expiry: Seconds an idle connection is kept open.
+            transport: Optional transport for the client this instance creates,
+                so several instances can share one connection pool. It is
+                left open on close; the caller closes it.
         """
         self.access_token = access_token
         self.timeout = timeout
-        self._client: httpx.AsyncClient | None = None
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.transport = transport
+        self._client: httpx.AsyncClient | None = http_client
+        self._owns_client = http_client is None
+
+    @property
+    def access_token(self) -> str | None:
+        """User access token for account operations."""
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, access_token: str | None) -> None:
+        self._access_token = access_token
+        # Built once per token rather than on every accounts request
+        self._accounts_headers = (
+            {
+                "x-sequence-access-token": f"Bearer {access_token}",
+                "Content-Type": "application/json",
+            }
+            if access_token
+            else None
+        )
+
+    @classmethod
+    def create_http_client(
+        cls,
+        timeout: float = 30.0,
+        limits: httpx.Limits | None = None,
+        http2: bool = True,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> httpx.AsyncClient:
+        """Create an HTTP client configured for the Sequence API.
+
+        Args:
+            timeout: Request timeout in seconds.
+            limits: Connection pool limits. Defaults to `DEFAULT_LIMITS`.
+            http2: Whether to negotiate HTTP/2, so concurrent requests are
+                multiplexed over a single connection.
+            transport: Optional transport to send requests through. When
+                given, its own pool settings apply instead of `limits` and
+                `http2`.
+        """
+        return httpx.AsyncClient(
+            base_url=cls.BASE_URL,
+            timeout=timeout,
+            limits=limits or cls.DEFAULT_LIMITS,
+            http2=http2,
+            transport=transport,
+        )
 
     async def __aenter__(self) -> "SequenceClient":
         """Enter async context manager."""
-        self._client = httpx.AsyncClient(
-            base_url=self.BASE_URL,
-            timeout=self.timeout,
-        )
+        self._get_client()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
         """Exit async context manager."""
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        await self.close()
 
     def _get_client(self) -> httpx.AsyncClient:
         """Get the HTTP client, creating one if necessary."""
         if self._client is None:
-            self._client = httpx.AsyncClient(
-                base_url=self.BASE_URL,
+            self._client = self.create_http_client(
                 timeout=self.timeout,
+                limits=self.limits,
+                transport=self.transport,
             )
         return self._client
 
     async def close(self) -> None:
-        """Close the HTTP client."""
-        if self._client:
-            await self._client.aclose()
+        """Close the HTTP client, unless it was provided by the caller.
+
+        A client built on a caller's transport is dropped without closing it,
+        since closing it would close the transport and its pooled connections.
+        """
+        if self._client and self._owns_client:
+            if self.transport is None:
+                await self._client.aclose()
             self._client = None
 
-    def _handle_error_response(self, response: httpx.Response) -> None:
-        """Handle error responses from the API."""
+    def _handle_error_response(self, response: httpx.Response) -> NoReturn:
+        """Raise a SequenceError for an error response from the API."""
         try:
-            data = response.json()
+            data = orjson.loads(response.content)
             code = data.get("code", "UNKNOWN_ERROR")
             message = data.get("message", "Unknown error")
         except Exception:
@@ -77,6 +186,23 @@ class SequenceClient:
 
         raise SequenceError(code=code, message=message, status_code=response.status_code)
 
+    async def _fetch_accounts(self) -> bytes:
+        """Request the accounts endpoint and return the raw response body."""
+        # Set exactly when there is a token, and skips the property lookup
+        if self._accounts_headers is None:
+            raise ValueError("Access token is required for fetching accounts")
+
+        client = self._get_client()
+        response = await client.post(
+            "/accounts",
+            headers=self._accounts_headers,
+            content=self._EMPTY_JSON,
+        )
+
+        if response.status_code == 200:
+            return response.content
+        self._handle_error_response(response)
+
     async def get_accounts(self) -> list[Account]:
         """Fetch all accounts with their balances.
 
@@ -87,24 +213,25 @@ class SequenceClient:
             SequenceError: If the API request fails.
             ValueError: If no access token is configured.
         """
-        if not self.access_token:
-            raise ValueError("Access token is required for fetching accounts")
+        content = await self._fetch_accounts()
+        accounts_response = _ACCOUNTS_VALIDATOR.validate_json(content)
+        return accounts_response.data.accounts
 
-        client = self._get_client()
-        response = await client.post(
-            "/accounts",
-            headers={
-                "x-sequence-access-token": f"Bearer {self.access_token}",
-                "Content-Type": "application/json",
-            },
-            json={},
-        )
+    async def get_accounts_data(self) -> list[AccountData]:
+        """Fetch all accounts with their balances as plain dicts.
 
-        if response.status_code != 200:
-            self._handle_error_response(response)
+        The response is validated as in `get_accounts`, but no models are
+        built; each account keeps the API's camelCase field names.
 
-        accounts_response = AccountsResponse.model_validate(response.json())
-        return accounts_response.data.accounts
+        Returns:
+            List of AccountData dicts with balance information.
+
+        Raises:
+            SequenceError: If the API request fails.
+            ValueError: If no access token is configured.
+        """
+        content = await self._fetch_accounts()
+        return _ACCOUNTS_ADAPTER.validate_json(content)["data"].get("accounts", [])
 
     async def trigger_rule(
         self,
@@ -129,20 +256,56 @@ class SequenceClient:
         """
         client = self._get_client()
 
-        headers = {
-            "x-sequence-signature": f"Bearer {api_secret}",
-            "Content-Type": "application/json",
-        }
+        headers = _signature_headers(api_secret)
         if idempotency_key:
-            headers["idempotency-key"] = idempotency_key
+            headers = {**headers, "idempotency-key": idempotency_key}
 
-        response = await client.post(
-            f"/remote-api/rules/{rule_id}/trigger",
-            headers=headers,
-            json=payload or {},
-        )
+        url = f"/remote-api/rules/{rule_id}/trigger"
+        if payload:
+            response = await client.post(url, headers=headers, json=payload)
+        else:
+            response = await client.post(url, headers=headers, content=self._EMPTY_JSON)
+
+        if response.status_code == 200:
+            return _TRIGGER_VALIDATOR.validate_json(response.content)
+        self._handle_error_response(response)
+
+    async def trigger_rules(
+        self,
+        specs: list[TriggerSpec],
+        max_concurrency: int = 10,
+    ) -> list[TriggerRuleResponse | BaseException]:
+        """Trigger several rules concurrently.
+
+        Up to `max_concurrency` requests are in flight at once over the client's
+        connection pool, so a batch takes a few round-trips instead of one per
+        rule without flooding the rate-limited trigger endpoint.
+
+        Args:
+            specs: The rules to trigger, with their secrets and options.
+            max_concurrency: Most trigger requests to send at the same time.
 
-        if response.status_code != 200:
-            self._handle_error_response(response)
+        Returns:
+            One entry per spec, in the same order: the TriggerRuleResponse, or
+            the exception (usually a SequenceError) raised for that rule.
 
-        return TriggerRuleResponse.model_validate(response.json())
+        Raises:
+            ValueError: If `max_concurrency` is less than 1.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def trigger(spec: TriggerSpec) -> TriggerRuleResponse:
+            async with semaphore:
+                return await self.trigger_rule(
+                    rule_id=spec.rule_id,
+                    api_secret=spec.api_secret,
+                    payload=spec.payload,
+                    idempotency_key=spec.idempotency_key,
+                )
+
+        return await asyncio.gather(
+            *(trigger(spec) for spec in specs),
+            return_exceptions=True,
+        )
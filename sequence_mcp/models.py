@@ -1,7 +1,10 @@
-"""Pydantic models for Sequence API responses."""
+"""Pydantic models for Sequence API requests and responses."""
 
-from typing import Literal
-from pydantic import BaseModel, Field
+from typing import Any, Literal
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import NotRequired, TypedDict
+
+AccountType = Literal["Pod", "Income Source", "Account"]
 
 
 class AccountBalance(BaseModel):
@@ -23,9 +26,7 @@ class Account(BaseModel):
     id: str = Field(description="Unique identifier for the account")
     name: str = Field(description="Display name of the account")
     balance: AccountBalance = Field(description="Balance information")
-    type: Literal["Pod", "Income Source", "Account"] = Field(
-        description="Type of account"
-    )
+    type: AccountType = Field(description="Type of account")
 
 
 class AccountsResponseData(BaseModel):
@@ -57,6 +58,56 @@ class TriggerRuleResponse(BaseModel):
     data: TriggerRuleResponseData
 
 
+class AccountBalanceData(TypedDict):
+    """Balance information for an account, keyed by the API's field names."""
+
+    amountInDollars: float | None
+    error: NotRequired[str | None]
+
+
+class AccountData(TypedDict):
+    """A financial account as a plain dict, keyed by the API's field names."""
+
+    id: str
+    name: str
+    balance: AccountBalanceData
+    type: AccountType
+
+
+class _AccountsRespData(TypedDict):
+    accounts: NotRequired[list[AccountData]]
+    errors: NotRequired[list[str]]
+
+
+class _AccountsResp(TypedDict):
+    message: str
+    requestId: str
+    data: _AccountsRespData
+
+
+# Bound once so the client can hand raw response bytes straight to pydantic-core
+_ACCOUNTS_VALIDATOR = AccountsResponse.__pydantic_validator__
+_TRIGGER_VALIDATOR = TriggerRuleResponse.__pydantic_validator__
+
+# Validates the accounts envelope into dicts, without building any models
+_ACCOUNTS_ADAPTER = TypeAdapter(_AccountsResp)
+
+
+class TriggerSpec(BaseModel):
+    """Parameters for triggering a single rule."""
+
+    rule_id: str = Field(min_length=1, description="The ID of the rule to trigger")
+    api_secret: str = Field(min_length=1, description="The API secret associated with the rule")
+    payload: dict[str, Any] | None = Field(
+        default=None,
+        description="Optional JSON payload to send with the trigger",
+    )
+    idempotency_key: str | None = Field(
+        default=None,
+        description="Optional key to prevent duplicate triggers",
+    )
+
+
 class SequenceErrorResponse(BaseModel):
     """Error response from the API."""
 
@@ -67,6 +118,8 @@ class SequenceErrorResponse(BaseModel):
 class SequenceError(Exception):
     """Exception raised for Sequence API errors."""
 
+    __slots__ = ("code", "message", "status_code")
+
     def __init__(self, code: str, message: str, status_code: int | None = None):
         self.code = code
         self.message = message
@@ -1,98 +1,241 @@
 """MCP server for the Sequence Banking API."""
 
+import asyncio
+import functools
 import os
 import sys
-import json
+import time
 import logging
 from typing import Any
 
+import httpx
+import orjson
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
+from pydantic import ValidationError
 
 from .client import SequenceClient
-from .models import SequenceError
-
-# Configure logging to stderr so Claude Code can see errors
-# (stdout is reserved for MCP protocol messages)
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    stream=sys.stderr,
-)
+from .models import SequenceError, TriggerRuleResponse, TriggerSpec
+
 logger = logging.getLogger("sequence-mcp")
 
+
+def _configure_logging() -> None:
+    """Log to stderr at `SEQUENCE_MCP_LOG_LEVEL`, or INFO if that is not a level name."""
+    value = os.environ.get("SEQUENCE_MCP_LOG_LEVEL", "INFO")
+    # Returns the level number for a registered level name, or a string otherwise
+    level = logging.getLevelName(value.upper())
+    valid = isinstance(level, int)
+    # Configure logging to stderr so Claude Code can see errors
+    # (stdout is reserved for MCP protocol messages)
+    logging.basicConfig(
+        level=level if valid else logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr,
+    )
+    if not valid:
+        logger.warning("Ignoring SEQUENCE_MCP_LOG_LEVEL=%r: not a logging level, using INFO", value)
+
+
+_configure_logging()
+
 server = Server("sequence-banking")
 
+# HTTP client shared across tool calls so connections to the API are reused
+_http_client: httpx.AsyncClient | None = None
+
+# Read from the environment once at startup; it never changes for a stdio server
+_access_token: str | None = None
+
+DEFAULT_ACCOUNTS_CACHE_TTL = 2.0
+
+
+def _read_accounts_cache_ttl() -> float:
+    """Read `SEQUENCE_MCP_ACCOUNTS_TTL`, falling back to the default if it is not a number."""
+    value = os.environ.get("SEQUENCE_MCP_ACCOUNTS_TTL")
+    if value is None:
+        return DEFAULT_ACCOUNTS_CACHE_TTL
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(
+            "Ignoring SEQUENCE_MCP_ACCOUNTS_TTL=%r: not a number of seconds, using %s",
+            value,
+            DEFAULT_ACCOUNTS_CACHE_TTL,
+        )
+        return DEFAULT_ACCOUNTS_CACHE_TTL
+
+
+# Seconds a get_accounts response is reused for repeated calls (0 disables)
+ACCOUNTS_CACHE_TTL = _read_accounts_cache_ttl()
+
+# (access token, monotonic fetch time, response) for the last get_accounts call
+_accounts_cache: tuple[str, float, list[TextContent]] | None = None
+
+# Monotonic time of the last trigger that may have moved money; responses
+# fetched before it are not cached
+_accounts_cleared_at = 0.0
+
+# Pending get_accounts requests by access token, awaited by concurrent callers
+_accounts_inflight: dict[str, asyncio.Task[list[TextContent]]] = {}
+
+# Most rules one trigger_rules_batch call may trigger; the API rate-limits triggers
+MAX_BATCH_TRIGGERS = 50
+
+
+def _text(text: str) -> TextContent:
+    """Wrap text in a TextContent without running pydantic validation.
+
+    The fields are always valid here, so `model_construct` is used to skip
+    validating every response that is built.
+    """
+    return TextContent.model_construct(type="text", text=text)
+
+
+def load_access_token() -> str | None:
+    """Read the access token from environment and cache it for later calls."""
+    global _access_token
+    _access_token = os.environ.get("SEQUENCE_ACCESS_TOKEN")
+    return _access_token
+
 
 def get_access_token() -> str | None:
-    """Get the access token from environment."""
-    return os.environ.get("SEQUENCE_ACCESS_TOKEN")
+    """Get the access token loaded by `load_access_token`."""
+    return _access_token
 
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List available tools."""
-    return [
-        Tool(
-            name="get_accounts",
-            description=(
-                "Fetch all financial accounts from Sequence with their current balances. "
-                "Returns Pods, Income Sources, and external accounts with balance information. "
-                "Requires SEQUENCE_ACCESS_TOKEN environment variable."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": [],
-            },
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = SequenceClient.create_http_client()
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client if one was created."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+# Arguments for triggering one rule, shared by trigger_rule and trigger_rules_batch
+_TRIGGER_RULE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "rule_id": {
+            "type": "string",
+            "description": "The ID of the rule to trigger (e.g., 'ru_12345')",
+        },
+        "api_secret": {
+            "type": "string",
+            "description": "The API secret associated with this rule",
+        },
+        "payload": {
+            "type": "object",
+            "description": "Optional JSON payload to send with the trigger",
+            "default": {},
+        },
+        "idempotency_key": {
+            "type": "string",
+            "description": "Optional key to prevent duplicate triggers on retry",
+        },
+    },
+    "required": ["rule_id", "api_secret"],
+}
+
+# Tool descriptors never change, so they are built once at import time.
+# A tuple, so a caller changing the returned list cannot alter them.
+_TOOLS: tuple[Tool, ...] = (
+    Tool(
+        name="get_accounts",
+        description=(
+            "Fetch all financial accounts from Sequence with their current balances. "
+            "Returns Pods, Income Sources, and external accounts with balance information. "
+            "Requires SEQUENCE_ACCESS_TOKEN environment variable."
         ),
-        Tool(
-            name="trigger_rule",
-            description=(
-                "Trigger an automation rule in Sequence. "
-                "Rules can automate financial workflows like transfers. "
-                "Requires the rule ID and its associated API secret."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "rule_id": {
-                        "type": "string",
-                        "description": "The ID of the rule to trigger (e.g., 'ru_12345')",
-                    },
-                    "api_secret": {
-                        "type": "string",
-                        "description": "The API secret associated with this rule",
-                    },
-                    "payload": {
-                        "type": "object",
-                        "description": "Optional JSON payload to send with the trigger",
-                        "default": {},
-                    },
-                    "idempotency_key": {
-                        "type": "string",
-                        "description": "Optional key to prevent duplicate triggers on retry",
-                    },
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": [],
+        },
+    ),
+    Tool(
+        name="trigger_rule",
+        description=(
+            "Trigger an automation rule in Sequence. "
+            "Rules can automate financial workflows like transfers. "
+            "Requires the rule ID and its associated API secret."
+        ),
+        inputSchema=_TRIGGER_RULE_SCHEMA,
+    ),
+    Tool(
+        name="trigger_rules_batch",
+        description=(
+            "Trigger several automation rules in Sequence at once. "
+            "The rules are triggered concurrently and a result is returned for each, "
+            "so one failing rule does not stop the others."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "triggers": {
+                    "type": "array",
+                    "description": "The rules to trigger, each with its own API secret",
+                    "items": _TRIGGER_RULE_SCHEMA,
+                    "minItems": 1,
+                    "maxItems": MAX_BATCH_TRIGGERS,
                 },
-                "required": ["rule_id", "api_secret"],
             },
-        ),
-    ]
+            "required": ["triggers"],
+        },
+    ),
+)
+
+
+# Validation errors with fixed messages are serialized once at import time
+_ERR_NO_TOKEN = orjson.dumps(
+    {"error": True, "message": "SEQUENCE_ACCESS_TOKEN environment variable is not set"}
+).decode()
+_ERR_RULE_ID = orjson.dumps({"error": True, "message": "rule_id is required"}).decode()
+_ERR_API_SECRET = orjson.dumps({"error": True, "message": "api_secret is required"}).decode()
+_ERR_TRIGGERS = orjson.dumps({"error": True, "message": "triggers is required"}).decode()
+_ERR_TOO_MANY_TRIGGERS = orjson.dumps(
+    {"error": True, "message": f"triggers accepts at most {MAX_BATCH_TRIGGERS} rules"}
+).decode()
+
+_NO_TOKEN_CONTENT = [_text(_ERR_NO_TOKEN)]
+_RULE_ID_REQUIRED_CONTENT = [_text(_ERR_RULE_ID)]
+_API_SECRET_REQUIRED_CONTENT = [_text(_ERR_API_SECRET)]
+_TRIGGERS_REQUIRED_CONTENT = [_text(_ERR_TRIGGERS)]
+_TOO_MANY_TRIGGERS_CONTENT = [_text(_ERR_TOO_MANY_TRIGGERS)]
+
+
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List available tools."""
+    return list(_TOOLS)
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
     """Handle tool calls."""
-    logger.info("Tool called: %s with arguments: %s", name, arguments)
+    logger.info("Tool called: %s", name)
+    # Arguments may carry large payloads, so only format them when asked to
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Tool %s arguments: %s", name, arguments)
     try:
         if name == "get_accounts":
             result = await handle_get_accounts()
         elif name == "trigger_rule":
             result = await handle_trigger_rule(arguments)
+        elif name == "trigger_rules_batch":
+            result = await handle_trigger_rules_batch(arguments)
         else:
             logger.warning("Unknown tool requested: %s", name)
-            return [TextContent(type="text", text=f"Unknown tool: {name}")]
+            return [_text(f"Unknown tool: {name}")]
         logger.debug("Tool %s completed successfully", name)
         return result
     except SequenceError as e:
@@ -104,62 +247,95 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
             e.status_code,
         )
         return [
-            TextContent(
-                type="text",
-                text=json.dumps(
+            _text(
+                orjson.dumps(
                     {
                         "error": True,
                         "code": e.code,
                         "message": e.message,
                         "status_code": e.status_code,
                     }
-                ),
+                ).decode()
             )
         ]
     except Exception as e:
         logger.exception("Unexpected error in tool %s: %s", name, e)
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({"error": True, "message": str(e)}),
-            )
-        ]
+        return [_text(orjson.dumps({"error": True, "message": str(e)}).decode())]
 
 
 async def handle_get_accounts() -> list[TextContent]:
-    """Handle the get_accounts tool call."""
+    """Handle the get_accounts tool call.
+
+    Responses are reused for `ACCOUNTS_CACHE_TTL` seconds, and concurrent
+    calls share one in-flight request, so clients that poll balances do not
+    trigger an API request per call.
+    """
     access_token = get_access_token()
     if not access_token:
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps(
-                    {
-                        "error": True,
-                        "message": "SEQUENCE_ACCESS_TOKEN environment variable is not set",
-                    }
-                ),
-            )
-        ]
+        return _NO_TOKEN_CONTENT
+
+    if _accounts_cache is not None:
+        cached_token, fetched_at, cached_content = _accounts_cache
+        if cached_token == access_token and time.monotonic() - fetched_at < ACCOUNTS_CACHE_TTL:
+            return cached_content
+
+    task = _accounts_inflight.get(access_token)
+    if task is None:
+        # The request runs in its own task, not in the first caller's, so
+        # cancelling any one caller leaves it running for the others
+        task = asyncio.ensure_future(_fetch_accounts(access_token))
+        _accounts_inflight[access_token] = task
+        task.add_done_callback(functools.partial(_forget_inflight, access_token))
+    # Shielded so that a cancelled caller does not cancel the shared request
+    return await asyncio.shield(task)
+
 
-    async with SequenceClient(access_token=access_token) as client:
-        accounts = await client.get_accounts()
+def _forget_inflight(access_token: str, task: asyncio.Task[list[TextContent]]) -> None:
+    """Drop a finished accounts request, so the next call after it starts a new one."""
+    # A trigger may already have dropped it, and a newer request taken its place
+    if _accounts_inflight.get(access_token) is task:
+        del _accounts_inflight[access_token]
+
+
+async def _fetch_accounts(access_token: str) -> list[TextContent]:
+    """Fetch and format the accounts response, and cache it."""
+    global _accounts_cache
+
+    fetched_at = time.monotonic()
+    client = SequenceClient(access_token=access_token, http_client=get_http_client())
+    accounts = await client.get_accounts_data()
 
     result = {
         "accounts": [
             {
-                "id": account.id,
-                "name": account.name,
-                "type": account.type,
-                "balance_dollars": account.balance.amount_in_dollars,
-                "balance_error": account.balance.error,
+                "id": account["id"],
+                "name": account["name"],
+                "type": account["type"],
+                "balance_dollars": account["balance"]["amountInDollars"],
+                "balance_error": account["balance"].get("error"),
             }
             for account in accounts
         ],
         "total_accounts": len(accounts),
     }
 
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    text = orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+    content = [_text(text)]
+    if fetched_at > _accounts_cleared_at:
+        _accounts_cache = (access_token, fetched_at, content)
+    return content
+
+
+def _clear_accounts_cache() -> None:
+    """Forget cached balances after a trigger, since a rule can move money.
+
+    Requests still in flight are dropped too, so later calls start a new
+    request instead of joining one that began before the trigger.
+    """
+    global _accounts_cache, _accounts_cleared_at
+    _accounts_cache = None
+    _accounts_inflight.clear()
+    _accounts_cleared_at = time.monotonic()
 
 
 async def handle_trigger_rule(arguments: dict[str, Any]) -> list[TextContent]:
@@ -170,28 +346,19 @@ async def handle_trigger_rule(arguments: dict[str, Any]) -> list[TextContent]:
     idempotency_key = arguments.get("idempotency_key")
 
     if not rule_id:
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({"error": True, "message": "rule_id is required"}),
-            )
-        ]
+        return _RULE_ID_REQUIRED_CONTENT
 
     if not api_secret:
-        return [
-            TextContent(
-                type="text",
-                text=json.dumps({"error": True, "message": "api_secret is required"}),
-            )
-        ]
+        return _API_SECRET_REQUIRED_CONTENT
 
-    async with SequenceClient() as client:
-        response = await client.trigger_rule(
-            rule_id=rule_id,
-            api_secret=api_secret,
-            payload=payload,
-            idempotency_key=idempotency_key,
-        )
+    client = SequenceClient(http_client=get_http_client())
+    response = await client.trigger_rule(
+        rule_id=rule_id,
+        api_secret=api_secret,
+        payload=payload,
+        idempotency_key=idempotency_key,
+    )
+    _clear_accounts_cache()
 
     result = {
         "success": True,
@@ -200,7 +367,88 @@ async def handle_trigger_rule(arguments: dict[str, Any]) -> list[TextContent]:
         "request_id": response.data.request_id,
     }
 
-    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+    text = orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+    return [_text(text)]
+
+
+async def handle_trigger_rules_batch(arguments: dict[str, Any]) -> list[TextContent]:
+    """Handle the trigger_rules_batch tool call."""
+    triggers = arguments.get("triggers")
+    if not triggers:
+        return _TRIGGERS_REQUIRED_CONTENT
+
+    if len(triggers) > MAX_BATCH_TRIGGERS:
+        return _TOO_MANY_TRIGGERS_CONTENT
+
+    # Invalid entries are reported as failed results, like rules the API rejects
+    entries = [_batch_trigger_spec(trigger) for trigger in triggers]
+    specs = [entry for entry in entries if isinstance(entry, TriggerSpec)]
+
+    client = SequenceClient(http_client=get_http_client())
+    responses = iter(await client.trigger_rules(specs))
+
+    results = []
+    for trigger, entry in zip(triggers, entries):
+        if isinstance(entry, str):
+            rule_id = trigger.get("rule_id") if isinstance(trigger, dict) else None
+            results.append({"rule_id": rule_id, "success": False, "message": entry})
+            continue
+
+        rule_id = entry.rule_id
+        response = next(responses)
+        if isinstance(response, TriggerRuleResponse):
+            results.append(
+                {
+                    "rule_id": rule_id,
+                    "success": True,
+                    "code": response.code,
+                    "message": response.message,
+                    "request_id": response.data.request_id,
+                }
+            )
+        elif isinstance(response, SequenceError):
+            results.append(
+                {
+                    "rule_id": rule_id,
+                    "success": False,
+                    "code": response.code,
+                    "message": response.message,
+                    "status_code": response.status_code,
+                }
+            )
+        else:
+            results.append({"rule_id": rule_id, "success": False, "message": str(response)})
+
+    succeeded = sum(1 for result in results if result["success"])
+    if succeeded:
+        _clear_accounts_cache()
+    result = {
+        "results": results,
+        "total_succeeded": succeeded,
+        "total_failed": len(results) - succeeded,
+    }
+
+    text = orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+    return [_text(text)]
+
+
+def _batch_trigger_spec(trigger: Any) -> TriggerSpec | str:
+    """Build the spec for one trigger_rules_batch entry, checked like trigger_rule's arguments.
+
+    Returns:
+        The TriggerSpec, or why the entry cannot be triggered. The message never
+        includes the entry's own values, which may hold its API secret.
+    """
+    if not isinstance(trigger, dict):
+        return "trigger must be an object"
+    if not trigger.get("rule_id"):
+        return "rule_id is required"
+    if not trigger.get("api_secret"):
+        return "api_secret is required"
+    try:
+        return TriggerSpec.model_validate(trigger)
+    except ValidationError:
+        return "trigger arguments are invalid"
 
 
 async def main():  # pragma: no cover
@@ -208,12 +456,18 @@ async def main():  # pragma: no cover
     logger.info("Starting Sequence MCP server...")
 
     # Log environment status (without exposing secrets)
-    access_token = get_access_token()
+    access_token = load_access_token()
     if access_token:
         logger.info("SEQUENCE_ACCESS_TOKEN is set (%d chars)", len(access_token))
     else:
         logger.warning("SEQUENCE_ACCESS_TOKEN is not set - get_accounts will fail")
 
+    # Let tasks that finish without suspending skip the scheduler round-trip
+    if sys.version_info >= (3, 12):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
+    get_http_client()
+
     try:
         async with stdio_server() as (read_stream, write_stream):
             logger.info("MCP stdio server started, awaiting requests...")
@@ -225,15 +479,44 @@ async def main():  # pragma: no cover
     except Exception as e:
         logger.exception("MCP server error: %s", e)
         raise
+    finally:
+        await close_http_client()
 
 
-if __name__ == "__main__":  # pragma: no cover
-    import asyncio
+def _run_cli(run=asyncio.run, main_fn=main) -> int:
+    """Run the server until it stops.
 
+    Args:
+        run: Runs a coroutine to completion in a new event loop.
+        main_fn: Returns the coroutine that runs the server.
+
+    Returns:
+        The process exit code: 0 once the server stops, 1 after a fatal error.
+    """
     try:
-        asyncio.run(main())
+        run(main_fn())
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
         logger.exception("Fatal error starting server: %s", e)
-        sys.exit(1)
+        return 1
+    return 0
+
+
+def _cli_entrypoint() -> None:
+    """Run the server from the command line until it stops."""
+    # Prefer the libuv-backed event loop where it is available (not on Windows)
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+    exit_code = _run_cli()
+    if exit_code:
+        sys.exit(exit_code)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    _cli_entrypoint()
@@ -1,9 +1,120 @@
 """Shared test fixtures."""
 
+import asyncio
+import re
+import sys
+from types import MappingProxyType
+
+import httpx
+import orjson
 import pytest
+import respx
+
+from sequence_mcp import server
+from sequence_mcp.client import SequenceClient
+
+# Run the tests on uvloop, like the server, wherever it is installed.
+# pytest-asyncio builds its loops from the current policy.
+if sys.platform != "win32":
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+@pytest.fixture(scope="session")
+async def shared_transport():
+    """One HTTP transport, and so one connection pool, for the clients tests build."""
+    async with httpx.AsyncHTTPTransport() as transport:
+        yield transport
+
+
+@pytest.fixture(scope="session")
+async def shared_client(shared_transport):
+    """A SequenceClient, with an access token, reused by every test in the session."""
+    async with SequenceClient(access_token="test_token", transport=shared_transport) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+async def tools():
+    """The server's tool list, fetched once; tests must only read it."""
+    return await server.list_tools()
+
+
+@pytest.fixture(scope="module")
+def respx_mock(request):
+    """A respx router mocking the Sequence API, started once per test module.
+
+    Routes are relative to `SequenceClient.BASE_URL`. Settings from a
+    `pytest.mark.respx(...)` marker on the module override the defaults.
+    pytest-describe collects each describe block as a module, so in practice
+    every block gets its own router and its own module-scoped routes.
+    """
+    marker = request.node.get_closest_marker("respx")
+    settings = {"base_url": SequenceClient.BASE_URL, "assert_all_called": False}
+    if marker:
+        settings.update(marker.kwargs)
+    with respx.mock(**settings) as router:
+        yield router
+
+
+# Matches the trigger endpoint of any rule
+_TRIGGER_PATH_RE = re.compile(r"^/remote-api/rules/[^/]+/trigger$")
+
+
+@pytest.fixture(scope="module")
+def trigger_route(respx_mock):
+    """The trigger route for every rule, registered once; tests set its response."""
+    return respx_mock.post(path__regex=_TRIGGER_PATH_RE)
+
+
+@pytest.fixture(autouse=True)
+def isolate_respx_routes(request):
+    """Drop the routes and calls a test added to the module's respx router."""
+    if "respx_mock" not in request.fixturenames:
+        yield
+        return
+    router = request.getfixturevalue("respx_mock")
+    # reset() only clears recorded calls; rollback() also removes new routes
+    router.snapshot()
+    yield
+    router.rollback()
+
 
+@pytest.fixture(autouse=True)
+def reset_server_state(monkeypatch):
+    """Forget the access token and accounts responses left by a previous test."""
+    monkeypatch.setattr(server, "_access_token", None)
+    monkeypatch.setattr(server, "_accounts_cache", None)
+    monkeypatch.setattr(server, "_accounts_cleared_at", 0.0)
+    monkeypatch.setattr(server, "_accounts_inflight", {})
 
-@pytest.fixture
+
+@pytest.fixture(autouse=True)
+async def close_shared_http_client():
+    """Close the server's shared HTTP client after each test."""
+    yield
+    await server.close_http_client()
+
+
+# Headers for mocked responses built from the pre-serialized sample responses
+JSON_CT = MappingProxyType({"content-type": "application/json"})
+
+
+def parse_result(result):
+    """Decode the JSON body of a tool result's first (and only) text content."""
+    return orjson.loads(result[0].text)
+
+
+# The sample responses are built once and shared by every test in the session.
+# They stay plain dicts, so they can be serialized and compared directly;
+# tests must treat them as read-only.
+
+
+@pytest.fixture(scope="session")
 def sample_accounts_response():
     """Sample response from the accounts endpoint."""
     return {
@@ -35,7 +146,7 @@ def sample_accounts_response():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_trigger_response():
     """Sample response from the trigger rule endpoint."""
     return {
@@ -45,22 +156,52 @@ def sample_trigger_response():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_error_response_unauthorized():
     """Sample unauthorized error response."""
     return {"code": "INVALID_ACCESS_TOKEN", "message": "Unauthorized"}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_error_response_invalid_secret():
     """Sample invalid API secret error response."""
     return {"code": "INVALID_API_SECRET", "message": "Unauthorized"}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_error_response_rate_limit():
     """Sample rate limit error response."""
     return {
         "code": "TOO_MANY_REQUESTS",
         "message": "Rule with id ru_12345 has been triggered too many times. Please try again later.",
     }
+
+
+@pytest.fixture(scope="session")
+def sample_accounts_response_bytes(sample_accounts_response):
+    """The sample accounts response, serialized once."""
+    return orjson.dumps(sample_accounts_response)
+
+
+@pytest.fixture(scope="session")
+def sample_trigger_response_bytes(sample_trigger_response):
+    """The sample trigger rule response, serialized once."""
+    return orjson.dumps(sample_trigger_response)
+
+
+@pytest.fixture(scope="session")
+def sample_error_response_unauthorized_bytes(sample_error_response_unauthorized):
+    """The sample unauthorized error response, serialized once."""
+    return orjson.dumps(sample_error_response_unauthorized)
+
+
+@pytest.fixture(scope="session")
+def sample_error_response_invalid_secret_bytes(sample_error_response_invalid_secret):
+    """The sample invalid API secret error response, serialized once."""
+    return orjson.dumps(sample_error_response_invalid_secret)
+
+
+@pytest.fixture(scope="session")
+def sample_error_response_rate_limit_bytes(sample_error_response_rate_limit):
+    """The sample rate limit error response, serialized once."""
+    return orjson.dumps(sample_error_response_rate_limit)
@@ -1,330 +1,556 @@
 """Tests for the Sequence API client."""
 
+import asyncio
+import json
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Mapping
+
 import pytest
 import httpx
-import respx
-
-from sequence_mcp.client import SequenceClient
-from sequence_mcp.models import SequenceError
-
-
-def describe_SequenceClient():
-    """Tests for SequenceClient."""
-
-    def describe_initialization():
-        """Tests for client initialization."""
-
-        def it_creates_client_with_access_token():
-            client = SequenceClient(access_token="test_token")
-            assert client.access_token == "test_token"
-            assert client.timeout == 30.0
-
-        def it_creates_client_with_custom_timeout():
-            client = SequenceClient(access_token="test_token", timeout=60.0)
-            assert client.timeout == 60.0
-
-        def it_creates_client_without_access_token():
-            client = SequenceClient()
-            assert client.access_token is None
-
-    def describe_get_accounts():
-        """Tests for fetching accounts."""
+import orjson
+
+from sequence_mcp import client as client_module
+from sequence_mcp.client import SequenceClient, _signature_headers
+from sequence_mcp.models import (
+    Account,
+    AccountBalance,
+    AccountsResponse,
+    AccountsResponseData,
+    SequenceError,
+    TriggerRuleResponse,
+    TriggerRuleResponseData,
+    TriggerSpec,
+)
+
+from .conftest import JSON_CT
+
+# Headers the requests in these tests are expected to carry
+_EXPECTED_ACCOUNTS_HEADERS = MappingProxyType(
+    {"x-sequence-access-token": "Bearer test_token", "content-type": "application/json"}
+)
+_EXPECTED_TRIGGER_HEADERS = MappingProxyType(
+    {"x-sequence-signature": "Bearer my_rule_secret", "content-type": "application/json"}
+)
+_EXPECTED_IDEMPOTENCY_HEADERS = MappingProxyType({"idempotency-key": "unique-key-123"})
+
+# The response the module's accounts route returns, set by each test
+_accounts_response: ContextVar[httpx.Response] = ContextVar("accounts_response")
+
+
+@pytest.fixture(scope="module")
+def accounts_route(respx_mock):
+    """The accounts route, registered once for every test in the module."""
+    return respx_mock.post("/accounts").mock(side_effect=lambda request: _accounts_response.get())
+
+
+class _ConstructValidator:
+    """Stands in for a model validator, building models without validating."""
+
+    def __init__(self, build):
+        self._build = build
+
+    def validate_json(self, content):
+        return self._build(orjson.loads(content))
+
+
+def _construct_accounts(data):
+    return AccountsResponse.model_construct(
+        message=data["message"],
+        request_id=data["requestId"],
+        data=AccountsResponseData.model_construct(
+            accounts=[
+                Account.model_construct(
+                    id=account["id"],
+                    name=account["name"],
+                    balance=AccountBalance.model_construct(
+                        amount_in_dollars=account["balance"]["amountInDollars"],
+                        error=account["balance"].get("error"),
+                    ),
+                    type=account["type"],
+                )
+                for account in data["data"].get("accounts", [])
+            ],
+            errors=data["data"].get("errors", []),
+        ),
+    )
+
+
+def _construct_trigger(data):
+    return TriggerRuleResponse.model_construct(
+        code=data["code"],
+        message=data["message"],
+        data=TriggerRuleResponseData.model_construct(request_id=data["data"]["requestId"]),
+    )
+
+
+@pytest.fixture
+def unvalidated_responses(monkeypatch):
+    """Parse API responses without pydantic validation, for tests about requests.
+
+    Parsing itself is covered by the model tests and the other client tests.
+    """
+    monkeypatch.setattr(
+        client_module, "_ACCOUNTS_VALIDATOR", _ConstructValidator(_construct_accounts)
+    )
+    monkeypatch.setattr(
+        client_module, "_TRIGGER_VALIDATOR", _ConstructValidator(_construct_trigger)
+    )
+
+
+@dataclass(frozen=True)
+class _TriggerCase:
+    """A trigger_rule scenario: the call, the mocked response and the expectations.
+
+    `body` is the response JSON, raw bytes for a non-JSON response, or the
+    name of a sample response fixture, sent as its pre-serialized bytes.
+    Cases that only check the request set `unvalidated` to skip parsing it.
+    """
+
+    rule_id: str = "ru_test"
+    api_secret: str = "secret"
+    payload: dict[str, Any] | None = None
+    idempotency_key: str | None = None
+    status: int = 200
+    body: dict[str, Any] | bytes | str = "sample_trigger_response"
+    expected_headers: Mapping[str, str] = field(default_factory=dict)
+    error_code: str | None = None
+    error_message: str = ""
+    unvalidated: bool = False
+
+
+_TRIGGER_CASES = [
+    pytest.param(
+        _TriggerCase(rule_id="ru_12345", api_secret="secret_123"),
+        id="triggers_rule_successfully",
+    ),
+    pytest.param(
+        _TriggerCase(
+            api_secret="my_rule_secret",
+            expected_headers=_EXPECTED_TRIGGER_HEADERS,
+            unvalidated=True,
+        ),
+        id="sends_correct_headers",
+    ),
+    pytest.param(
+        _TriggerCase(
+            idempotency_key="unique-key-123",
+            expected_headers=_EXPECTED_IDEMPOTENCY_HEADERS,
+            unvalidated=True,
+        ),
+        id="includes_idempotency_key_when_provided",
+    ),
+    pytest.param(
+        _TriggerCase(payload={"amount": 100, "note": "test"}, unvalidated=True),
+        id="sends_payload_when_provided",
+    ),
+    pytest.param(
+        _TriggerCase(
+            api_secret="wrong_secret",
+            status=401,
+            body="sample_error_response_invalid_secret",
+            error_code="INVALID_API_SECRET",
+        ),
+        id="handles_invalid_api_secret",
+    ),
+    pytest.param(
+        _TriggerCase(
+            rule_id="ru_12345",
+            status=429,
+            body="sample_error_response_rate_limit",
+            error_code="TOO_MANY_REQUESTS",
+        ),
+        id="handles_rate_limit_error",
+    ),
+    pytest.param(
+        _TriggerCase(
+            rule_id="invalid",
+            status=400,
+            body={"code": "INVALID_REQUEST", "message": "Invalid request"},
+            error_code="INVALID_REQUEST",
+        ),
+        id="handles_invalid_rule_id",
+    ),
+    pytest.param(
+        _TriggerCase(
+            status=500,
+            body=b"Internal Server Error",
+            error_code="HTTP_ERROR",
+            error_message="500",
+        ),
+        id="handles_non_json_error_response",
+    ),
+]
+
+
+def describe_initialization():
+    """Tests for client initialization."""
+
+    def it_creates_client_with_access_token():
+        client = SequenceClient(access_token="test_token")
+        assert client.access_token == "test_token"
+        assert client.timeout == 30.0
+
+    def it_creates_client_with_custom_timeout():
+        client = SequenceClient(access_token="test_token", timeout=60.0)
+        assert client.timeout == 60.0
+
+    def it_creates_client_with_default_pool_limits():
+        client = SequenceClient(access_token="test_token")
+        assert client.limits == SequenceClient.DEFAULT_LIMITS
+        assert client.limits.keepalive_expiry == 15.0
+
+    def it_creates_client_with_custom_pool_limits():
+        client = SequenceClient(
+            max_connections=50,
+            max_keepalive_connections=10,
+            keepalive_expiry=5.0,
+        )
+        assert client.limits.max_connections == 50
+        assert client.limits.max_keepalive_connections == 10
+        assert client.limits.keepalive_expiry == 5.0
+
+    def it_creates_client_without_access_token():
+        client = SequenceClient()
+        assert client.access_token is None
+
+    def it_rebuilds_account_headers_when_token_changes():
+        client = SequenceClient(access_token="first_token")
+        client.access_token = "second_token"
+        assert client.access_token == "second_token"
+        assert client._accounts_headers["x-sequence-access-token"] == "Bearer second_token"
+
+    def it_does_not_allow_arbitrary_attributes():
+        client = SequenceClient()
+        with pytest.raises(AttributeError):
+            client.unknown = "value"
+
+    def it_builds_http_client_on_provided_transport(shared_transport):
+        client = SequenceClient(transport=shared_transport)
+        assert client._get_client()._transport is shared_transport
+
+    def it_uses_provided_http_client():
+        http_client = httpx.AsyncClient()
+        client = SequenceClient(http_client=http_client)
+        assert client._get_client() is http_client
+
+
+def describe_get_accounts():
+    """Tests for fetching accounts."""
+
+    async def it_fetches_accounts_successfully(
+        accounts_route, shared_client, sample_accounts_response_bytes
+    ):
+        _accounts_response.set(
+            httpx.Response(200, content=sample_accounts_response_bytes, headers=JSON_CT)
+        )
+
+        accounts = await shared_client.get_accounts()
+
+        assert len(accounts) == 3
+        assert accounts[0].id == "5579244"
+        assert accounts[0].name == "Main Operating Pod"
+        assert accounts[0].type == "Pod"
+        assert accounts[0].balance.amount_in_dollars == 25342.77
+        assert accounts[0].balance.error is None
+
+    @pytest.mark.usefixtures("unvalidated_responses")
+    async def it_sends_correct_headers(
+        accounts_route, shared_client, sample_accounts_response_bytes
+    ):
+        _accounts_response.set(
+            httpx.Response(200, content=sample_accounts_response_bytes, headers=JSON_CT)
+        )
+
+        await shared_client.get_accounts()
+
+        assert accounts_route.call_count == 1
+        request = accounts_route.calls[0].request
+        sent_headers = {k: request.headers.get(k) for k in _EXPECTED_ACCOUNTS_HEADERS}
+        assert sent_headers == _EXPECTED_ACCOUNTS_HEADERS
+        assert request.content == b"{}"
+
+    async def it_raises_error_without_access_token(shared_transport):
+        async with SequenceClient(transport=shared_transport) as client:
+            with pytest.raises(ValueError, match="Access token is required"):
+                await client.get_accounts()
 
-        @pytest.mark.asyncio
-        @respx.mock
-        async def it_fetches_accounts_successfully(sample_accounts_response):
-            respx.post("https://api.getsequence.io/accounts").mock(
-                return_value=httpx.Response(200, json=sample_accounts_response)
+    async def it_handles_unauthorized_error(
+        accounts_route, shared_client, sample_error_response_unauthorized_bytes
+    ):
+        _accounts_response.set(
+            httpx.Response(401, content=sample_error_response_unauthorized_bytes, headers=JSON_CT)
+        )
+
+        with pytest.raises(SequenceError) as exc_info:
+            await shared_client.get_accounts()
+
+        assert exc_info.value.code == "INVALID_ACCESS_TOKEN"
+        assert exc_info.value.message == "Unauthorized"
+        assert exc_info.value.status_code == 401
+
+    async def it_handles_accounts_with_balance_errors(accounts_route, shared_client):
+        response = {
+            "message": "OK",
+            "requestId": "test-123",
+            "data": {
+                "accounts": [
+                    {
+                        "id": "123",
+                        "name": "Test Account",
+                        "balance": {
+                            "amountInDollars": None,
+                            "error": "Connection failed",
+                        },
+                        "type": "Account",
+                    }
+                ],
+                "errors": [],
+            },
+        }
+        _accounts_response.set(httpx.Response(200, json=response))
+
+        accounts = await shared_client.get_accounts()
+
+        assert len(accounts) == 1
+        assert accounts[0].balance.amount_in_dollars is None
+        assert accounts[0].balance.error == "Connection failed"
+
+
+def describe_get_accounts_data():
+    """Tests for fetching accounts as plain dicts."""
+
+    async def it_fetches_accounts_as_dicts(
+        accounts_route, shared_transport, sample_accounts_response, sample_accounts_response_bytes
+    ):
+        _accounts_response.set(
+            httpx.Response(200, content=sample_accounts_response_bytes, headers=JSON_CT)
+        )
+
+        async with SequenceClient(access_token="test_token", transport=shared_transport) as client:
+            accounts = await client.get_accounts_data()
+
+        assert accounts == sample_accounts_response["data"]["accounts"]
+
+    async def it_returns_empty_list_when_accounts_are_missing(accounts_route, shared_transport):
+        _accounts_response.set(
+            httpx.Response(200, json={"message": "OK", "requestId": "test-123", "data": {}})
+        )
+
+        async with SequenceClient(access_token="test_token", transport=shared_transport) as client:
+            accounts = await client.get_accounts_data()
+
+        assert accounts == []
+
+    async def it_raises_error_without_access_token(shared_transport):
+        async with SequenceClient(transport=shared_transport) as client:
+            with pytest.raises(ValueError, match="Access token is required"):
+                await client.get_accounts_data()
+
+
+def describe_trigger_rule():
+    """Tests for triggering rules."""
+
+    @pytest.mark.parametrize("case", _TRIGGER_CASES)
+    async def it_triggers_rule(request, trigger_route, shared_client, case):
+        if case.unvalidated:
+            request.getfixturevalue("unvalidated_responses")
+        body = case.body
+        if isinstance(body, str):
+            response = httpx.Response(
+                case.status, content=request.getfixturevalue(f"{body}_bytes"), headers=JSON_CT
             )
-
-            async with SequenceClient(access_token="test_token") as client:
-                accounts = await client.get_accounts()
-
-            assert len(accounts) == 3
-            assert accounts[0].id == "5579244"
-            assert accounts[0].name == "Main Operating Pod"
-            assert accounts[0].type == "Pod"
-            assert accounts[0].balance.amount_in_dollars == 25342.77
-            assert accounts[0].balance.error is None
-
-        @pytest.mark.asyncio
-        @respx.mock
-        async def it_sends_correct_headers(sample_accounts_response):
-            route = respx.post("https://api.getsequence.io/accounts").mock(
-                return_value=httpx.Response(200, json=sample_accounts_response)
+            body = request.getfixturevalue(body)
+        elif isinstance(body, bytes):
+            response = httpx.Response(
+                case.status, content=body, headers={"content-type": "text/plain"}
             )
-
-            async with SequenceClient(access_token="my_secret_token") as client:
-                await client.get_accounts()
-
-            request = route.calls[0].request
-            assert request.headers["x-sequence-access-token"] == "Bearer my_secret_token"
-            assert request.headers["content-type"] == "application/json"
-
-        @pytest.mark.asyncio
-        async def it_raises_error_without_access_token():
-            async with SequenceClient() as client:
-                with pytest.raises(ValueError, match="Access token is required"):
-                    await client.get_accounts()
-
-        @pytest.mark.asyncio
-        @respx.mock
-        async def it_handles_unauthorized_error(sample_error_response_unauthorized):
-            respx.post("https://api.getsequence.io/accounts").mock(
-                return_value=httpx.Response(401, json=sample_error_response_unauthorized)
+        else:
+            response = httpx.Response(case.status, json=body)
+        trigger_route.mock(return_value=response)
+        kwargs = {
+            "rule_id": case.rule_id,
+            "api_secret": case.api_secret,
+            "payload": case.payload,
+            "idempotency_key": case.idempotency_key,
+        }
+
+        if case.error_code:
+            with pytest.raises(SequenceError) as exc_info:
+                await shared_client.trigger_rule(**kwargs)
+
+            assert exc_info.value.code == case.error_code
+            assert exc_info.value.status_code == case.status
+            assert case.error_message in exc_info.value.message
+            return
+
+        result = await shared_client.trigger_rule(**kwargs)
+
+        assert result.code == "OK"
+        assert result.message == body["message"]
+        assert result.data.request_id == body["data"]["requestId"]
+        request = trigger_route.calls[0].request
+        assert request.url.path == f"/remote-api/rules/{case.rule_id}/trigger"
+        assert {k: request.headers.get(k) for k in case.expected_headers} == case.expected_headers
+        assert orjson.loads(request.content) == (case.payload or {})
+        assert "idempotency-key" not in _signature_headers(case.api_secret)
+
+    async def it_sends_integers_beyond_64_bits_in_the_payload(
+        trigger_route, shared_client, sample_trigger_response_bytes
+    ):
+        trigger_route.mock(
+            return_value=httpx.Response(
+                200, content=sample_trigger_response_bytes, headers=JSON_CT
             )
-
-            async with SequenceClient(access_token="invalid_token") as client:
-                with pytest.raises(SequenceError) as exc_info:
-                    await client.get_accounts()
-
-            assert exc_info.value.code == "INVALID_ACCESS_TOKEN"
-            assert exc_info.value.message == "Unauthorized"
-            assert exc_info.value.status_code == 401
-
-        @pytest.mark.asyncio
-        @respx.mock
-        async def it_handles_accounts_with_balance_errors():
-            response = {
-                "message": "OK",
-                "requestId": "test-123",
-                "data": {
-                    "accounts": [
-                        {
-                            "id": "123",
-                            "name": "Test Account",
-                            "balance": {
-                                "amountInDollars": None,
-                                "error": "Connection failed",
-                            },
-                            "type": "Account",
-                        }
-                    ],
-                    "errors": [],
-                },
-            }
-            respx.post("https://api.getsequence.io/accounts").mock(
-                return_value=httpx.Response(200, json=response)
+        )
+
+        await shared_client.trigger_rule(
+            rule_id="ru_12345", api_secret="secret", payload={"amount": 2**70}
+        )
+
+        assert json.loads(trigger_route.calls[0].request.content) == {"amount": 2**70}
+
+
+def describe_trigger_rules():
+    """Tests for triggering several rules at once."""
+
+    async def it_returns_a_result_per_rule_in_order(
+        trigger_route,
+        shared_transport,
+        sample_trigger_response_bytes,
+        sample_error_response_invalid_secret_bytes,
+    ):
+        responses_by_path = {
+            "/remote-api/rules/ru_1/trigger": httpx.Response(
+                200, content=sample_trigger_response_bytes, headers=JSON_CT
+            ),
+            "/remote-api/rules/ru_2/trigger": httpx.Response(
+                401, content=sample_error_response_invalid_secret_bytes, headers=JSON_CT
+            ),
+        }
+        trigger_route.mock(side_effect=lambda request: responses_by_path[request.url.path])
+
+        async with SequenceClient(transport=shared_transport) as client:
+            responses = await client.trigger_rules(
+                [
+                    TriggerSpec(rule_id="ru_1", api_secret="secret_1"),
+                    TriggerSpec(
+                        rule_id="ru_2",
+                        api_secret="secret_2",
+                        idempotency_key="batch-key",
+                    ),
+                ]
             )
 
-            async with SequenceClient(access_token="test_token") as client:
-                accounts = await client.get_accounts()
-
-            assert len(accounts) == 1
-            assert accounts[0].balance.amount_in_dollars is None
-            assert accounts[0].balance.error == "Connection failed"
-
-    def describe_trigger_rule():
-        """Tests for triggering rules."""
-
-        @pytest.mark.asyncio
-        @respx.mock
-        async def it_triggers_rule_successfully(sample_trigger_response):
-            respx.post(
-                "https://api.getsequence.io/remote-api/rules/ru_12345/trigger"
-            ).mock(return_value=httpx.Response(200, json=sample_trigger_response))
-
-            async with SequenceClient() as client:
-                response = await client.trigger_rule(
-                    rule_id="ru_12345",
-                    api_secret="secret_123",
+        assert isinstance(responses[0], TriggerRuleResponse)
+        assert responses[0].code == "OK"
+        assert isinstance(responses[1], SequenceError)
+        assert responses[1].code == "INVALID_API_SECRET"
+        [ru_2_request] = [
+            call.request for call in trigger_route.calls if "ru_2" in call.request.url.path
+        ]
+        assert ru_2_request.headers["idempotency-key"] == "batch-key"
+
+    async def it_limits_how_many_rules_are_triggered_at_once(
+        trigger_route, shared_transport, sample_trigger_response_bytes
+    ):
+        in_flight = 0
+        peak = 0
+
+        async def counted_response(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, content=sample_trigger_response_bytes, headers=JSON_CT)
+
+        trigger_route.mock(side_effect=counted_response)
+        specs = [TriggerSpec(rule_id=f"ru_{i}", api_secret="secret") for i in range(5)]
+
+        async with SequenceClient(transport=shared_transport) as client:
+            responses = await client.trigger_rules(specs, max_concurrency=2)
+
+        assert all(isinstance(response, TriggerRuleResponse) for response in responses)
+        assert trigger_route.call_count == 5
+        assert peak == 2
+
+    @pytest.mark.parametrize("max_concurrency", [0, -1])
+    async def it_rejects_a_max_concurrency_below_1(shared_transport, max_concurrency):
+        async with SequenceClient(transport=shared_transport) as client:
+            with pytest.raises(ValueError, match="max_concurrency must be at least 1"):
+                await client.trigger_rules(
+                    [TriggerSpec(rule_id="ru_1", api_secret="secret")],
+                    max_concurrency=max_concurrency,
                 )
 
-            assert response.code == "OK"
-            assert response.message == "Rule with id ru_12345 has been triggered"
-            assert response.data.request_id == "b28f1d9e-8c2a-4d3e-9af1-XXXXXXXXXXXX"
-
-        @pytest.mark.asyncio
-        @respx.mock
-        async def it_sends_correct_headers_for_rule_trigger(sample_trigger_response):
-            route = respx.post(
-                "https://api.getsequence.io/remote-api/rules/ru_test/trigger"
-            ).mock(return_value=httpx.Response(200, json=sample_trigger_response))
-
-            async with SequenceClient() as client:
-                await client.trigger_rule(
-                    rule_id="ru_test",
-                    api_secret="my_rule_secret",
-                )
+    async def it_returns_empty_list_for_no_rules(shared_transport):
+        async with SequenceClient(transport=shared_transport) as client:
+            assert await client.trigger_rules([]) == []
 
-            request = route.calls[0].request
-            assert request.headers["x-sequence-signature"] == "Bearer my_rule_secret"
-            assert request.headers["content-type"] == "application/json"
-
-        @pytest.mark.asyncio
-        @respx.mock
-        async def it_includes_idempotency_key_when_provided(sample_trigger_response):
-            route = respx.post(
-                "https://api.getsequence.io/remote-api/rules/ru_test/trigger"
-            ).mock(return_value=httpx.Response(200, json=sample_trigger_response))
-
-            async with SequenceClient() as client:
-                await client.trigger_rule(
-                    rule_id="ru_test",
-                    api_secret="secret",
-                    idempotency_key="unique-key-123",
-                )
 
-            request = route.calls[0].request
-            assert request.headers["idempotency-key"] == "unique-key-123"
-
-        @pytest.mark.asyncio
-        @respx.mock
-        async def it_sends_payload_when_provided(sample_trigger_response):
-            route = respx.post(
-                "https://api.getsequence.io/remote-api/rules/ru_test/trigger"
-            ).mock(return_value=httpx.Response(200, json=sample_trigger_response))
-
-            async with SequenceClient() as client:
-                await client.trigger_rule(
-                    rule_id="ru_test",
-                    api_secret="secret",
-                    payload={"amount": 100, "note": "test"},
-                )
+def describe_error_handling():
+    """Tests for error response handling."""
 
-            request = route.calls[0].request
-            import json
+    async def it_handles_non_json_error_responses(accounts_route, shared_transport):
+        """When the API returns a non-JSON error (e.g., HTML error page), the client
+        should still raise a SequenceError with an HTTP_ERROR code."""
+        _accounts_response.set(
+            httpx.Response(
+                502,
+                content=b"<html><body>Bad Gateway</body></html>",
+                headers={"content-type": "text/html"},
+            )
+        )
 
-            body = json.loads(request.content)
-            assert body == {"amount": 100, "note": "test"}
+        async with SequenceClient(access_token="test_token", transport=shared_transport) as client:
+            with pytest.raises(SequenceError) as exc_info:
+                await client.get_accounts()
 
-        @pytest.mark.asyncio
-        @respx.mock
-        async def it_handles_invalid_api_secret(sample_error_response_invalid_secret):
-            respx.post(
-                "https://api.getsequence.io/remote-api/rules/ru_test/trigger"
-            ).mock(
-                return_value=httpx.Response(401, json=sample_error_response_invalid_secret)
-            )
+        assert exc_info.value.code == "HTTP_ERROR"
+        assert "502" in exc_info.value.message
+        assert exc_info.value.status_code == 502
 
-            async with SequenceClient() as client:
-                with pytest.raises(SequenceError) as exc_info:
-                    await client.trigger_rule(
-                        rule_id="ru_test",
-                        api_secret="wrong_secret",
-                    )
-
-            assert exc_info.value.code == "INVALID_API_SECRET"
-            assert exc_info.value.status_code == 401
-
-        @pytest.mark.asyncio
-        @respx.mock
-        async def it_handles_rate_limit_error(sample_error_response_rate_limit):
-            respx.post(
-                "https://api.getsequence.io/remote-api/rules/ru_12345/trigger"
-            ).mock(
-                return_value=httpx.Response(429, json=sample_error_response_rate_limit)
-            )
 
-            async with SequenceClient() as client:
-                with pytest.raises(SequenceError) as exc_info:
-                    await client.trigger_rule(
-                        rule_id="ru_12345",
-                        api_secret="secret",
-                    )
-
-            assert exc_info.value.code == "TOO_MANY_REQUESTS"
-            assert exc_info.value.status_code == 429
-
-        @pytest.mark.asyncio
-        @respx.mock
-        async def it_handles_invalid_rule_id():
-            respx.post(
-                "https://api.getsequence.io/remote-api/rules/invalid/trigger"
-            ).mock(
-                return_value=httpx.Response(
-                    400, json={"code": "INVALID_REQUEST", "message": "Invalid request"}
-                )
-            )
+def describe_context_manager():
+    """Tests for async context manager behavior."""
 
-            async with SequenceClient() as client:
-                with pytest.raises(SequenceError) as exc_info:
-                    await client.trigger_rule(
-                        rule_id="invalid",
-                        api_secret="secret",
-                    )
-
-            assert exc_info.value.code == "INVALID_REQUEST"
-            assert exc_info.value.status_code == 400
-
-        @pytest.mark.asyncio
-        @respx.mock
-        async def it_handles_non_json_error_response():
-            respx.post(
-                "https://api.getsequence.io/remote-api/rules/ru_test/trigger"
-            ).mock(
-                return_value=httpx.Response(
-                    500, content=b"Internal Server Error", headers={"content-type": "text/plain"}
-                )
-            )
+    async def it_opens_and_closes_its_http_client():
+        client = SequenceClient(access_token="test")
+        assert client._client is None
 
-            async with SequenceClient() as client:
-                with pytest.raises(SequenceError) as exc_info:
-                    await client.trigger_rule(
-                        rule_id="ru_test",
-                        api_secret="secret",
-                    )
-
-            assert exc_info.value.code == "HTTP_ERROR"
-            assert "500" in exc_info.value.message
-            assert exc_info.value.status_code == 500
-
-    def describe_error_handling():
-        """Tests for error response handling."""
-
-        @pytest.mark.asyncio
-        @respx.mock
-        async def it_handles_non_json_error_responses():
-            """When the API returns a non-JSON error (e.g., HTML error page), the client
-            should still raise a SequenceError with an HTTP_ERROR code."""
-            respx.post("https://api.getsequence.io/accounts").mock(
-                return_value=httpx.Response(
-                    502,
-                    content=b"<html><body>Bad Gateway</body></html>",
-                    headers={"content-type": "text/html"},
-                )
-            )
+        # Closing or exiting before the client exists is a no-op
+        await client.close()
+        await client.__aexit__(None, None, None)
+        assert client._client is None
 
-            async with SequenceClient(access_token="test_token") as client:
-                with pytest.raises(SequenceError) as exc_info:
-                    await client.get_accounts()
+        async with client:
+            assert client._client is not None
+        assert client._client is None
 
-            assert exc_info.value.code == "HTTP_ERROR"
-            assert "502" in exc_info.value.message
-            assert exc_info.value.status_code == 502
+        client._get_client()
+        assert client._client is not None
+        await client.close()
+        assert client._client is None
 
-    def describe_context_manager():
-        """Tests for async context manager behavior."""
+    async def it_leaves_provided_transport_open():
+        class RecordingTransport(httpx.AsyncBaseTransport):
+            closed = False
 
-        @pytest.mark.asyncio
-        async def it_properly_closes_client():
-            client = SequenceClient(access_token="test")
-            async with client:
-                assert client._client is not None
-            assert client._client is None
+            async def aclose(self):
+                self.closed = True
 
-        @pytest.mark.asyncio
-        async def it_can_close_manually():
-            client = SequenceClient(access_token="test")
-            client._get_client()  # Initialize the internal client
+        transport = RecordingTransport()
+        async with SequenceClient(transport=transport) as client:
             assert client._client is not None
-            await client.close()
-            assert client._client is None
-
-        @pytest.mark.asyncio
-        async def it_handles_exit_when_client_is_none():
-            """Test __aexit__ when _client was never initialized."""
-            client = SequenceClient(access_token="test")
-            assert client._client is None
-            # Manually call __aexit__ without __aenter__
-            await client.__aexit__(None, None, None)
-            assert client._client is None
-
-        @pytest.mark.asyncio
-        async def it_handles_close_when_client_is_none():
-            """Test close() when _client was never initialized."""
-            client = SequenceClient(access_token="test")
-            assert client._client is None
-            # Should not raise any errors
-            await client.close()
-            assert client._client is None
+        assert client._client is None
+        assert not transport.closed
+
+    async def it_leaves_provided_http_client_open():
+        http_client = SequenceClient.create_http_client()
+        async with SequenceClient(http_client=http_client) as client:
+            assert client._client is http_client
+        assert client._client is http_client
+        assert not http_client.is_closed
+        await http_client.aclose()
@@ -1,28 +1,37 @@
 """Tests for Pydantic models."""
 
 import pytest
+from pydantic import ValidationError
 
 from sequence_mcp.models import (
+    _ACCOUNTS_ADAPTER,
     Account,
     AccountBalance,
     AccountsResponse,
     TriggerRuleResponse,
+    TriggerSpec,
     SequenceError,
 )
 
+# Bound once so each parse calls the compiled validator directly
+_validate_balance = AccountBalance.__pydantic_validator__.validate_python
+_validate_account = Account.__pydantic_validator__.validate_python
+_validate_accounts_response = AccountsResponse.__pydantic_validator__.validate_python
+_validate_trigger_response = TriggerRuleResponse.__pydantic_validator__.validate_python
+
 
 def describe_AccountBalance():
     """Tests for AccountBalance model."""
 
     def it_parses_balance_with_alias():
         data = {"amountInDollars": 1234.56, "error": None}
-        balance = AccountBalance.model_validate(data)
+        balance = _validate_balance(data)
         assert balance.amount_in_dollars == 1234.56
         assert balance.error is None
 
     def it_handles_null_balance_with_error():
         data = {"amountInDollars": None, "error": "Connection timeout"}
-        balance = AccountBalance.model_validate(data)
+        balance = _validate_balance(data)
         assert balance.amount_in_dollars is None
         assert balance.error == "Connection timeout"
 
@@ -30,38 +39,27 @@ def describe_AccountBalance():
 def describe_Account():
     """Tests for Account model."""
 
-    def it_parses_pod_account():
-        data = {
-            "id": "123",
-            "name": "Savings Pod",
-            "balance": {"amountInDollars": 5000.00, "error": None},
-            "type": "Pod",
-        }
-        account = Account.model_validate(data)
-        assert account.id == "123"
-        assert account.name == "Savings Pod"
-        assert account.type == "Pod"
-        assert account.balance.amount_in_dollars == 5000.00
-
-    def it_parses_income_source_account():
+    @pytest.mark.parametrize(
+        "acct_id,name,acct_type,amount",
+        [
+            ("123", "Savings Pod", "Pod", 5000.00),
+            ("456", "Client Payments", "Income Source", 10000.00),
+            ("external_789", "Chase Checking", "Account", 2500.00),
+        ],
+        ids=["pod", "income_source", "external"],
+    )
+    def it_parses_account_of_each_type(acct_id, name, acct_type, amount):
         data = {
-            "id": "456",
-            "name": "Client Payments",
-            "balance": {"amountInDollars": 10000.00, "error": None},
-            "type": "Income Source",
+            "id": acct_id,
+            "name": name,
+            "balance": {"amountInDollars": amount, "error": None},
+            "type": acct_type,
         }
-        account = Account.model_validate(data)
-        assert account.type == "Income Source"
-
-    def it_parses_external_account():
-        data = {
-            "id": "external_789",
-            "name": "Chase Checking",
-            "balance": {"amountInDollars": 2500.00, "error": None},
-            "type": "Account",
-        }
-        account = Account.model_validate(data)
-        assert account.type == "Account"
+        account = _validate_account(data)
+        assert account.id == acct_id
+        assert account.name == name
+        assert account.type == acct_type
+        assert account.balance.amount_in_dollars == amount
 
 
 def describe_AccountsResponse():
@@ -83,7 +81,7 @@ def describe_AccountsResponse():
                 "errors": [],
             },
         }
-        response = AccountsResponse.model_validate(data)
+        response = _validate_accounts_response(data)
         assert response.message == "OK"
         assert response.request_id == "req-123"
         assert len(response.data.accounts) == 1
@@ -97,11 +95,52 @@ def describe_AccountsResponse():
                 "errors": ["Failed to fetch external account"],
             },
         }
-        response = AccountsResponse.model_validate(data)
+        response = _validate_accounts_response(data)
         assert len(response.data.errors) == 1
         assert "external account" in response.data.errors[0]
 
 
+def describe_accounts_adapter():
+    """Tests for validating the accounts response into plain dicts."""
+
+    def it_returns_dicts_with_api_field_names():
+        data = {
+            "message": "OK",
+            "requestId": "req-123",
+            "data": {
+                "accounts": [
+                    {
+                        "id": "1",
+                        "name": "Test",
+                        "balance": {"amountInDollars": 100.0, "error": None},
+                        "type": "Pod",
+                    }
+                ],
+                "errors": [],
+            },
+        }
+        response = _ACCOUNTS_ADAPTER.validate_python(data)
+        assert response == data
+
+    def it_rejects_unknown_account_types():
+        data = {
+            "message": "OK",
+            "requestId": "req-123",
+            "data": {
+                "accounts": [
+                    {
+                        "id": "1",
+                        "name": "Test",
+                        "balance": {"amountInDollars": 100.0},
+                        "type": "Loan",
+                    }
+                ],
+            },
+        }
+        with pytest.raises(ValidationError):
+            _ACCOUNTS_ADAPTER.validate_python(data)
+
+
 def describe_TriggerRuleResponse():
     """Tests for TriggerRuleResponse model."""
 
@@ -111,12 +150,25 @@ def describe_TriggerRuleResponse():
             "message": "Rule with id ru_123 has been triggered",
             "data": {"requestId": "req-xyz"},
         }
-        response = TriggerRuleResponse.model_validate(data)
+        response = _validate_trigger_response(data)
         assert response.code == "OK"
         assert response.message == "Rule with id ru_123 has been triggered"
         assert response.data.request_id == "req-xyz"
 
 
+def describe_TriggerSpec():
+    """Tests for TriggerSpec model."""
+
+    def it_defaults_optional_fields_to_none():
+        spec = TriggerSpec.model_validate({"rule_id": "ru_1", "api_secret": "secret"})
+        assert spec.payload is None
+        assert spec.idempotency_key is None
+
+    def it_rejects_empty_rule_id():
+        with pytest.raises(ValidationError):
+            TriggerSpec.model_validate({"rule_id": "", "api_secret": "secret"})
+
+
 def describe_SequenceError():
     """Tests for SequenceError exception."""
 
@@ -141,3 +193,8 @@ def describe_SequenceError():
         with pytest.raises(SequenceError) as exc_info:
             raise SequenceError(code="TEST", message="test error")
         assert exc_info.value.code == "TEST"
+
+    def it_keeps_error_details_in_slots():
+        error = SequenceError(code="TEST", message="test error", status_code=500)
+        # Exceptions always have a __dict__, but the declared fields bypass it
+        assert error.__dict__ == {}
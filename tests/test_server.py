@@ -1,53 +1,132 @@
 """Tests for the MCP server."""
 
-import json
-import os
+import asyncio
+import logging
 
 import pytest
 import httpx
-import respx
-from unittest.mock import AsyncMock, patch
+import orjson
+from unittest.mock import MagicMock, patch
 
+from sequence_mcp.client import SequenceClient
+from sequence_mcp.models import SequenceError
 from sequence_mcp.server import (
     list_tools,
     call_tool,
     handle_get_accounts,
     handle_trigger_rule,
+    handle_trigger_rules_batch,
     main,
     get_access_token,
+    load_access_token,
+    get_http_client,
+    close_http_client,
 )
 
+from .conftest import JSON_CT, parse_result
+
+pytestmark = pytest.mark.respx(base_url=SequenceClient.BASE_URL)
+
+
+class _FakeCM:
+    """An async context manager that enters as `value`, or raises it if it is an exception."""
+
+    def __init__(self, value):
+        self.value = value
+
+    async def __aenter__(self):
+        if isinstance(self.value, BaseException):
+            raise self.value
+        return self.value
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+
+@pytest.fixture
+async def mock_client(monkeypatch, sample_accounts_response_bytes, sample_trigger_response_bytes):
+    """The server's shared HTTP client, answering fixed success responses by path.
+
+    For tests that always get the same response; it skips respx route matching.
+    """
+    from sequence_mcp import server
+
+    responses = {
+        "/accounts": sample_accounts_response_bytes,
+        "/remote-api/rules/ru_12345/trigger": sample_trigger_response_bytes,
+    }
+
+    def handler(request):
+        content = responses.get(request.url.path)
+        if content is None:
+            return httpx.Response(404)
+        return httpx.Response(200, content=content, headers=JSON_CT)
+
+    async with httpx.AsyncClient(
+        base_url=SequenceClient.BASE_URL, transport=httpx.MockTransport(handler)
+    ) as client:
+        monkeypatch.setattr(server, "_http_client", client)
+        yield client
+
+
+def describe_configure_logging():
+    """Tests for configuring logging from the environment."""
+
+    @pytest.fixture
+    def basic_config(monkeypatch):
+        """Record logging.basicConfig calls instead of configuring logging."""
+        calls = []
+        monkeypatch.setattr(logging, "basicConfig", lambda **kwargs: calls.append(kwargs))
+        return calls
+
+    @pytest.mark.parametrize(
+        "value, level", [(None, logging.INFO), ("debug", logging.DEBUG), ("ERROR", logging.ERROR)]
+    )
+    def it_uses_the_level_from_the_environment(monkeypatch, basic_config, value, level):
+        from sequence_mcp import server
+
+        if value is None:
+            monkeypatch.delenv("SEQUENCE_MCP_LOG_LEVEL", raising=False)
+        else:
+            monkeypatch.setenv("SEQUENCE_MCP_LOG_LEVEL", value)
+
+        server._configure_logging()
+
+        assert basic_config[0]["level"] == level
+
+    def it_falls_back_to_info_for_unknown_levels(monkeypatch, basic_config, caplog):
+        from sequence_mcp import server
+
+        monkeypatch.setenv("SEQUENCE_MCP_LOG_LEVEL", "verbose")
+
+        with caplog.at_level(logging.WARNING, logger="sequence-mcp"):
+            server._configure_logging()
+
+        assert basic_config[0]["level"] == logging.INFO
+        assert any("SEQUENCE_MCP_LOG_LEVEL" in record.message for record in caplog.records)
+
 
 def describe_list_tools():
     """Tests for listing available tools."""
 
-    @pytest.mark.asyncio
-    async def it_returns_two_tools():
-        tools = await list_tools()
-        assert len(tools) == 2
-
-    @pytest.mark.asyncio
-    async def it_includes_get_accounts_tool():
-        tools = await list_tools()
-        tool_names = [t.name for t in tools]
-        assert "get_accounts" in tool_names
-
-    @pytest.mark.asyncio
-    async def it_includes_trigger_rule_tool():
-        tools = await list_tools()
-        tool_names = [t.name for t in tools]
-        assert "trigger_rule" in tool_names
-
-    @pytest.mark.asyncio
-    async def it_has_correct_schema_for_get_accounts():
-        tools = await list_tools()
+    def it_returns_three_tools(tools):
+        assert len(tools) == 3
+
+    async def it_reuses_the_prebuilt_tools_between_calls():
+        first, second = await list_tools(), await list_tools()
+        assert first is not second
+        assert all(a is b for a, b in zip(first, second, strict=True))
+
+    @pytest.mark.parametrize("name", ["get_accounts", "trigger_rule", "trigger_rules_batch"])
+    def it_includes_tool(tools, name):
+        assert name in {t.name for t in tools}
+
+    def it_has_correct_schema_for_get_accounts(tools):
         get_accounts = next(t for t in tools if t.name == "get_accounts")
         assert get_accounts.inputSchema["type"] == "object"
         assert get_accounts.inputSchema["required"] == []
 
-    @pytest.mark.asyncio
-    async def it_has_correct_schema_for_trigger_rule():
-        tools = await list_tools()
+    def it_has_correct_schema_for_trigger_rule(tools):
         trigger_rule = next(t for t in tools if t.name == "trigger_rule")
         assert trigger_rule.inputSchema["type"] == "object"
         assert "rule_id" in trigger_rule.inputSchema["properties"]
@@ -55,33 +134,64 @@ def describe_list_tools():
         assert "rule_id" in trigger_rule.inputSchema["required"]
         assert "api_secret" in trigger_rule.inputSchema["required"]
 
+    def it_has_correct_schema_for_trigger_rules_batch(tools):
+        batch = next(t for t in tools if t.name == "trigger_rules_batch")
+        triggers = batch.inputSchema["properties"]["triggers"]
+        assert batch.inputSchema["required"] == ["triggers"]
+        assert triggers["type"] == "array"
+        assert triggers["maxItems"] == 50
+        assert triggers["items"]["required"] == ["rule_id", "api_secret"]
+
 
 def describe_call_tool():
     """Tests for the call_tool dispatcher."""
 
-    @pytest.mark.asyncio
     async def it_returns_error_for_unknown_tool():
         result = await call_tool("unknown_tool", {})
         assert len(result) == 1
         assert "Unknown tool" in result[0].text
 
-    @pytest.mark.asyncio
-    async def it_handles_exceptions_gracefully():
+    async def it_logs_arguments_only_at_debug_level(caplog):
+        with caplog.at_level(logging.INFO, logger="sequence-mcp"):
+            await call_tool("unknown_tool", {"secret": "hidden"})
+        assert not any("hidden" in record.getMessage() for record in caplog.records)
+
+        caplog.clear()
+        with caplog.at_level(logging.DEBUG, logger="sequence-mcp"):
+            await call_tool("unknown_tool", {"secret": "shown"})
+        assert any("shown" in record.getMessage() for record in caplog.records)
+
+    async def it_dispatches_get_accounts(mock_client, monkeypatch):
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "test_token")
+
+        load_access_token()
+        result = await call_tool("get_accounts", {})
+        data = parse_result(result)
+        assert data["total_accounts"] == 3
+
+    async def it_dispatches_trigger_rule(mock_client):
+        result = await call_tool(
+            "trigger_rule", {"rule_id": "ru_12345", "api_secret": "secret_abc"}
+        )
+        data = parse_result(result)
+        assert data["success"] is True
+
+    async def it_dispatches_trigger_rules_batch(mock_client):
+        trigger = {"rule_id": "ru_12345", "api_secret": "secret_abc"}
+        result = await call_tool("trigger_rules_batch", {"triggers": [trigger, trigger]})
+        data = parse_result(result)
+        assert data["total_succeeded"] == 2
+
+    async def it_handles_exceptions_gracefully(monkeypatch):
         # Call get_accounts without token set
-        original_token = os.environ.get("SEQUENCE_ACCESS_TOKEN")
-        if "SEQUENCE_ACCESS_TOKEN" in os.environ:
-            del os.environ["SEQUENCE_ACCESS_TOKEN"]
-
-        try:
-            result = await call_tool("get_accounts", {})
-            data = json.loads(result[0].text)
-            assert data["error"] is True
-            assert "SEQUENCE_ACCESS_TOKEN" in data["message"]
-        finally:
-            if original_token:
-                os.environ["SEQUENCE_ACCESS_TOKEN"] = original_token
-
-    @pytest.mark.asyncio
+        monkeypatch.delenv("SEQUENCE_ACCESS_TOKEN", raising=False)
+
+        load_access_token()
+        result = await call_tool("get_accounts", {})
+        data = parse_result(result)
+        assert data["error"] is True
+        assert "SEQUENCE_ACCESS_TOKEN" in data["message"]
+
     async def it_handles_unexpected_exceptions(monkeypatch):
         """When an unexpected exception (not SequenceError) occurs, the server
         should catch it and return a JSON error response."""
@@ -93,7 +203,7 @@ def describe_call_tool():
         monkeypatch.setattr(server, "handle_get_accounts", mock_handle_get_accounts)
 
         result = await call_tool("get_accounts", {})
-        data = json.loads(result[0].text)
+        data = parse_result(result)
 
         assert data["error"] is True
         assert "Unexpected internal error" in data["message"]
@@ -102,105 +212,394 @@ def describe_call_tool():
 def describe_handle_get_accounts():
     """Tests for the get_accounts handler."""
 
-    @pytest.mark.asyncio
-    async def it_returns_error_when_token_not_set():
-        original_token = os.environ.get("SEQUENCE_ACCESS_TOKEN")
-        if "SEQUENCE_ACCESS_TOKEN" in os.environ:
-            del os.environ["SEQUENCE_ACCESS_TOKEN"]
-
-        try:
-            result = await handle_get_accounts()
-            data = json.loads(result[0].text)
-            assert data["error"] is True
-            assert "SEQUENCE_ACCESS_TOKEN" in data["message"]
-        finally:
-            if original_token:
-                os.environ["SEQUENCE_ACCESS_TOKEN"] = original_token
-
-    @pytest.mark.asyncio
-    @respx.mock
-    async def it_returns_accounts_when_successful(sample_accounts_response):
-        respx.post("https://api.getsequence.io/accounts").mock(
-            return_value=httpx.Response(200, json=sample_accounts_response)
+    async def it_returns_error_when_token_not_set(monkeypatch):
+        monkeypatch.delenv("SEQUENCE_ACCESS_TOKEN", raising=False)
+
+        load_access_token()
+        result = await handle_get_accounts()
+        data = parse_result(result)
+        assert data["error"] is True
+        assert "SEQUENCE_ACCESS_TOKEN" in data["message"]
+
+    async def it_returns_accounts_when_successful(
+        respx_mock, sample_accounts_response_bytes, monkeypatch
+    ):
+        respx_mock.post("/accounts").mock(
+            return_value=httpx.Response(
+                200, content=sample_accounts_response_bytes, headers=JSON_CT
+            )
         )
 
-        original_token = os.environ.get("SEQUENCE_ACCESS_TOKEN")
-        os.environ["SEQUENCE_ACCESS_TOKEN"] = "test_token"
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "test_token")
 
-        try:
-            result = await handle_get_accounts()
-            data = json.loads(result[0].text)
-            assert "accounts" in data
-            assert data["total_accounts"] == 3
-            assert data["accounts"][0]["name"] == "Main Operating Pod"
-            assert data["accounts"][0]["balance_dollars"] == 25342.77
-        finally:
-            if original_token:
-                os.environ["SEQUENCE_ACCESS_TOKEN"] = original_token
-            else:
-                del os.environ["SEQUENCE_ACCESS_TOKEN"]
-
-    @pytest.mark.asyncio
-    @respx.mock
-    async def it_handles_api_errors(sample_error_response_unauthorized):
-        respx.post("https://api.getsequence.io/accounts").mock(
-            return_value=httpx.Response(401, json=sample_error_response_unauthorized)
+        load_access_token()
+        result = await handle_get_accounts()
+        data = parse_result(result)
+        assert "accounts" in data
+        assert data["total_accounts"] == 3
+        assert data["accounts"][0]["name"] == "Main Operating Pod"
+        assert data["accounts"][0]["balance_dollars"] == 25342.77
+
+    async def it_reports_balance_errors(respx_mock, monkeypatch):
+        respx_mock.post("/accounts").mock(
+            return_value=httpx.Response(
+                200,
+                json={
+                    "message": "OK",
+                    "requestId": "test-123",
+                    "data": {
+                        "accounts": [
+                            {
+                                "id": "123",
+                                "name": "Test Account",
+                                "balance": {
+                                    "amountInDollars": None,
+                                    "error": "Connection failed",
+                                },
+                                "type": "Account",
+                            },
+                            {
+                                "id": "456",
+                                "name": "Savings Pod",
+                                "balance": {"amountInDollars": 50.0},
+                                "type": "Pod",
+                            },
+                        ],
+                    },
+                },
+            )
+        )
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "test_token")
+        load_access_token()
+
+        result = await handle_get_accounts()
+        data = parse_result(result)
+
+        assert data["accounts"][0]["balance_dollars"] is None
+        assert data["accounts"][0]["balance_error"] == "Connection failed"
+        assert data["accounts"][1]["balance_error"] is None
+
+    async def it_reuses_the_response_within_the_ttl(
+        respx_mock, sample_accounts_response_bytes, monkeypatch
+    ):
+        route = respx_mock.post("/accounts").mock(
+            return_value=httpx.Response(
+                200, content=sample_accounts_response_bytes, headers=JSON_CT
+            )
         )
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "test_token")
+        load_access_token()
 
-        original_token = os.environ.get("SEQUENCE_ACCESS_TOKEN")
-        os.environ["SEQUENCE_ACCESS_TOKEN"] = "invalid_token"
+        first = await handle_get_accounts()
+        second = await handle_get_accounts()
 
-        try:
-            result = await call_tool("get_accounts", {})
-            data = json.loads(result[0].text)
-            assert data["error"] is True
-            assert data["code"] == "INVALID_ACCESS_TOKEN"
-        finally:
-            if original_token:
-                os.environ["SEQUENCE_ACCESS_TOKEN"] = original_token
-            else:
-                del os.environ["SEQUENCE_ACCESS_TOKEN"]
+        assert second is first
+        assert route.call_count == 1
 
+    async def it_refetches_after_the_ttl_expires(
+        respx_mock, sample_accounts_response_bytes, monkeypatch
+    ):
+        from sequence_mcp import server
 
-def describe_handle_trigger_rule():
-    """Tests for the trigger_rule handler."""
+        route = respx_mock.post("/accounts").mock(
+            return_value=httpx.Response(
+                200, content=sample_accounts_response_bytes, headers=JSON_CT
+            )
+        )
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "test_token")
+        monkeypatch.setattr(server, "ACCOUNTS_CACHE_TTL", 0)
+        load_access_token()
+
+        await handle_get_accounts()
+        await handle_get_accounts()
+
+        assert route.call_count == 2
+
+    async def it_does_not_reuse_responses_across_tokens(
+        respx_mock, sample_accounts_response_bytes, monkeypatch
+    ):
+        route = respx_mock.post("/accounts").mock(
+            return_value=httpx.Response(
+                200, content=sample_accounts_response_bytes, headers=JSON_CT
+            )
+        )
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "first_token")
+        load_access_token()
+        await handle_get_accounts()
+
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "second_token")
+        load_access_token()
+        await handle_get_accounts()
+
+        assert route.call_count == 2
+        assert route.calls[1].request.headers["x-sequence-access-token"] == "Bearer second_token"
+
+    async def it_shares_one_request_between_concurrent_calls(
+        respx_mock, sample_accounts_response_bytes, monkeypatch
+    ):
+        async def slow_response(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, content=sample_accounts_response_bytes, headers=JSON_CT)
+
+        route = respx_mock.post("/accounts").mock(
+            side_effect=slow_response
+        )
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "test_token")
+        load_access_token()
+
+        first, second = await asyncio.gather(handle_get_accounts(), handle_get_accounts())
+
+        assert second is first
+        assert route.call_count == 1
+
+    async def it_shares_errors_between_concurrent_calls(
+        respx_mock, sample_error_response_unauthorized_bytes, monkeypatch
+    ):
+        async def slow_error(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(
+                401, content=sample_error_response_unauthorized_bytes, headers=JSON_CT
+            )
 
-    @pytest.mark.asyncio
-    async def it_returns_error_when_rule_id_missing():
-        result = await handle_trigger_rule({"api_secret": "secret"})
-        data = json.loads(result[0].text)
+        route = respx_mock.post("/accounts").mock(side_effect=slow_error)
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "test_token")
+        load_access_token()
+
+        results = await asyncio.gather(
+            handle_get_accounts(), handle_get_accounts(), return_exceptions=True
+        )
+
+        assert all(isinstance(r, SequenceError) for r in results)
+        assert route.call_count == 1
+
+    async def it_answers_waiting_calls_when_the_first_caller_is_cancelled(
+        respx_mock, sample_accounts_response_bytes, monkeypatch
+    ):
+        from sequence_mcp import server
+
+        release = asyncio.Event()
+
+        async def held_response(request):
+            await release.wait()
+            return httpx.Response(200, content=sample_accounts_response_bytes, headers=JSON_CT)
+
+        route = respx_mock.post("/accounts").mock(side_effect=held_response)
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "test_token")
+        load_access_token()
+
+        leader = asyncio.create_task(handle_get_accounts())
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(handle_get_accounts())
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        data = parse_result(await follower)
+        assert data["total_accounts"] == 3
+        assert leader.cancelled()
+        assert route.call_count == 1
+        assert server._accounts_inflight == {}
+
+    async def it_handles_api_errors(
+        respx_mock, sample_error_response_unauthorized_bytes, monkeypatch
+    ):
+        respx_mock.post("/accounts").mock(
+            return_value=httpx.Response(
+                401, content=sample_error_response_unauthorized_bytes, headers=JSON_CT
+            )
+        )
+
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "invalid_token")
+
+        load_access_token()
+        result = await call_tool("get_accounts", {})
+        data = parse_result(result)
         assert data["error"] is True
-        assert "rule_id" in data["message"]
+        assert data["code"] == "INVALID_ACCESS_TOKEN"
+
 
-    @pytest.mark.asyncio
-    async def it_returns_error_when_api_secret_missing():
-        result = await handle_trigger_rule({"rule_id": "ru_123"})
-        data = json.loads(result[0].text)
+def describe_accounts_cache():
+    """Tests for how long get_accounts responses are reused."""
+
+    @pytest.fixture
+    def accounts_route(respx_mock, sample_accounts_response_bytes, monkeypatch):
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "test_token")
+        load_access_token()
+        return respx_mock.post("/accounts").mock(
+            return_value=httpx.Response(
+                200, content=sample_accounts_response_bytes, headers=JSON_CT
+            )
+        )
+
+    @pytest.fixture
+    def rule_route(respx_mock, sample_trigger_response_bytes):
+        return respx_mock.post("/remote-api/rules/ru_12345/trigger").mock(
+            return_value=httpx.Response(
+                200, content=sample_trigger_response_bytes, headers=JSON_CT
+            )
+        )
+
+    @pytest.mark.parametrize("value, ttl", [(None, 2.0), ("5", 5.0), ("0", 0.0)])
+    def it_reads_the_ttl_from_the_environment(monkeypatch, value, ttl):
+        from sequence_mcp import server
+
+        if value is None:
+            monkeypatch.delenv("SEQUENCE_MCP_ACCOUNTS_TTL", raising=False)
+        else:
+            monkeypatch.setenv("SEQUENCE_MCP_ACCOUNTS_TTL", value)
+
+        assert server._read_accounts_cache_ttl() == ttl
+
+    def it_falls_back_to_the_default_ttl_for_invalid_values(monkeypatch, caplog):
+        from sequence_mcp import server
+
+        monkeypatch.setenv("SEQUENCE_MCP_ACCOUNTS_TTL", "2s")
+
+        with caplog.at_level(logging.WARNING, logger="sequence-mcp"):
+            ttl = server._read_accounts_cache_ttl()
+
+        assert ttl == server.DEFAULT_ACCOUNTS_CACHE_TTL
+        assert any("SEQUENCE_MCP_ACCOUNTS_TTL" in record.message for record in caplog.records)
+
+    @pytest.mark.parametrize(
+        "tool, arguments",
+        [
+            ("trigger_rule", {"rule_id": "ru_12345", "api_secret": "secret"}),
+            (
+                "trigger_rules_batch",
+                {"triggers": [{"rule_id": "ru_12345", "api_secret": "secret"}]},
+            ),
+        ],
+    )
+    async def it_refetches_after_a_rule_is_triggered(accounts_route, rule_route, tool, arguments):
+        await handle_get_accounts()
+        await call_tool(tool, arguments)
+        await handle_get_accounts()
+
+        assert rule_route.call_count == 1
+        assert accounts_route.call_count == 2
+
+    async def it_keeps_the_response_after_a_failed_trigger(accounts_route, respx_mock):
+        respx_mock.post("/remote-api/rules/ru_1/trigger").mock(
+            return_value=httpx.Response(500, content=b"Internal Server Error")
+        )
+
+        await handle_get_accounts()
+        await handle_trigger_rules_batch({"triggers": [{"rule_id": "ru_1", "api_secret": "s"}]})
+        await handle_get_accounts()
+
+        assert accounts_route.call_count == 1
+
+    async def it_does_not_cache_a_response_fetched_before_a_trigger(
+        accounts_route, rule_route, sample_accounts_response_bytes
+    ):
+        release = asyncio.Event()
+
+        async def held_response(request):
+            await release.wait()
+            return httpx.Response(200, content=sample_accounts_response_bytes, headers=JSON_CT)
+
+        accounts_route.mock(side_effect=held_response)
+
+        fetch = asyncio.create_task(handle_get_accounts())
+        await asyncio.sleep(0.01)
+        await handle_trigger_rule({"rule_id": "ru_12345", "api_secret": "secret"})
+        release.set()
+        await fetch
+        await handle_get_accounts()
+
+        assert accounts_route.call_count == 2
+
+
+    async def it_starts_a_new_request_for_calls_after_a_trigger(
+        accounts_route, rule_route, sample_accounts_response_bytes
+    ):
+        from sequence_mcp import server
+
+        stale = orjson.dumps(
+            {
+                "message": "OK",
+                "requestId": "stale",
+                "data": {
+                    "accounts": [
+                        {
+                            "id": "5579244",
+                            "name": "Main Operating Pod",
+                            "balance": {"amountInDollars": 100.0, "error": None},
+                            "type": "Pod",
+                        }
+                    ],
+                    "errors": [],
+                },
+            }
+        )
+        releases = [asyncio.Event(), asyncio.Event()]
+        bodies = iter(zip(releases, [stale, sample_accounts_response_bytes]))
+
+        async def held_response(request):
+            release, body = next(bodies)
+            await release.wait()
+            return httpx.Response(200, content=body, headers=JSON_CT)
+
+        accounts_route.mock(side_effect=held_response)
+
+        before = asyncio.create_task(handle_get_accounts())
+        await asyncio.sleep(0.01)
+        await handle_trigger_rule({"rule_id": "ru_12345", "api_secret": "secret"})
+        after = asyncio.create_task(handle_get_accounts())
+        await asyncio.sleep(0.01)
+
+        # The request from before the trigger finishing must not drop the new one
+        releases[0].set()
+        await before
+        joined = asyncio.create_task(handle_get_accounts())
+        await asyncio.sleep(0.01)
+        releases[1].set()
+
+        for task in (after, joined):
+            data = parse_result(await task)
+            assert data["accounts"][0]["balance_dollars"] == 25342.77
+        assert parse_result(before.result())["accounts"][0]["balance_dollars"] == 100.0
+        assert accounts_route.call_count == 2
+        assert server._accounts_inflight == {}
+
+
+def describe_handle_trigger_rule():
+    """Tests for the trigger_rule handler."""
+
+    @pytest.mark.parametrize(
+        "args,missing",
+        [({"api_secret": "secret"}, "rule_id"), ({"rule_id": "ru_123"}, "api_secret")],
+    )
+    async def it_returns_error_when_field_missing(args, missing):
+        result = await handle_trigger_rule(args)
+        data = parse_result(result)
         assert data["error"] is True
-        assert "api_secret" in data["message"]
+        assert missing in data["message"]
 
-    @pytest.mark.asyncio
-    @respx.mock
-    async def it_triggers_rule_successfully(sample_trigger_response):
-        respx.post(
-            "https://api.getsequence.io/remote-api/rules/ru_12345/trigger"
-        ).mock(return_value=httpx.Response(200, json=sample_trigger_response))
+    async def it_triggers_rule_successfully(trigger_route, sample_trigger_response_bytes):
+        trigger_route.mock(
+            return_value=httpx.Response(
+                200, content=sample_trigger_response_bytes, headers=JSON_CT
+            )
+        )
 
         result = await handle_trigger_rule(
             {"rule_id": "ru_12345", "api_secret": "secret_123"}
         )
-        data = json.loads(result[0].text)
+        data = parse_result(result)
 
         assert data["success"] is True
         assert data["code"] == "OK"
         assert data["request_id"] == "b28f1d9e-8c2a-4d3e-9af1-XXXXXXXXXXXX"
 
-    @pytest.mark.asyncio
-    @respx.mock
-    async def it_passes_payload_to_api(sample_trigger_response):
-        route = respx.post(
-            "https://api.getsequence.io/remote-api/rules/ru_test/trigger"
-        ).mock(return_value=httpx.Response(200, json=sample_trigger_response))
+    async def it_passes_payload_to_api(trigger_route, sample_trigger_response_bytes):
+        trigger_route.mock(
+            return_value=httpx.Response(
+                200, content=sample_trigger_response_bytes, headers=JSON_CT
+            )
+        )
 
         await handle_trigger_rule(
             {
@@ -210,16 +609,16 @@ def describe_handle_trigger_rule():
             }
         )
 
-        request = route.calls[0].request
-        body = json.loads(request.content)
+        request = trigger_route.calls[0].request
+        body = orjson.loads(request.content)
         assert body == {"custom": "data"}
 
-    @pytest.mark.asyncio
-    @respx.mock
-    async def it_passes_idempotency_key_to_api(sample_trigger_response):
-        route = respx.post(
-            "https://api.getsequence.io/remote-api/rules/ru_test/trigger"
-        ).mock(return_value=httpx.Response(200, json=sample_trigger_response))
+    async def it_passes_idempotency_key_to_api(trigger_route, sample_trigger_response_bytes):
+        trigger_route.mock(
+            return_value=httpx.Response(
+                200, content=sample_trigger_response_bytes, headers=JSON_CT
+            )
+        )
 
         await handle_trigger_rule(
             {
@@ -229,229 +628,241 @@ def describe_handle_trigger_rule():
             }
         )
 
-        request = route.calls[0].request
+        request = trigger_route.calls[0].request
         assert request.headers["idempotency-key"] == "my-unique-key"
 
-    @pytest.mark.asyncio
-    @respx.mock
-    async def it_handles_api_errors(sample_error_response_invalid_secret):
-        respx.post(
-            "https://api.getsequence.io/remote-api/rules/ru_test/trigger"
-        ).mock(
-            return_value=httpx.Response(401, json=sample_error_response_invalid_secret)
+    async def it_handles_api_errors(trigger_route, sample_error_response_invalid_secret_bytes):
+        trigger_route.mock(
+            return_value=httpx.Response(
+                401, content=sample_error_response_invalid_secret_bytes, headers=JSON_CT
+            )
         )
 
         result = await call_tool(
             "trigger_rule", {"rule_id": "ru_test", "api_secret": "wrong"}
         )
-        data = json.loads(result[0].text)
+        data = parse_result(result)
 
         assert data["error"] is True
         assert data["code"] == "INVALID_API_SECRET"
         assert data["status_code"] == 401
 
 
+def describe_handle_trigger_rules_batch():
+    """Tests for the trigger_rules_batch handler."""
+
+    async def it_returns_error_when_triggers_missing():
+        result = await handle_trigger_rules_batch({})
+        data = parse_result(result)
+        assert data["error"] is True
+        assert "triggers" in data["message"]
+
+    async def it_rejects_more_than_the_maximum_triggers():
+        from sequence_mcp import server
+
+        trigger = {"rule_id": "ru_1", "api_secret": "secret_1"}
+        result = await handle_trigger_rules_batch(
+            {"triggers": [trigger] * (server.MAX_BATCH_TRIGGERS + 1)}
+        )
+        data = parse_result(result)
+        assert data["error"] is True
+        assert str(server.MAX_BATCH_TRIGGERS) in data["message"]
+
+    @pytest.mark.parametrize(
+        "trigger, rule_id, message",
+        [
+            ({"api_secret": "secret_1"}, None, "rule_id is required"),
+            ({"rule_id": "ru_1"}, "ru_1", "api_secret is required"),
+            (
+                {"rule_id": "ru_1", "api_secret": "secret_1", "payload": "not an object"},
+                "ru_1",
+                "trigger arguments are invalid",
+            ),
+            ("ru_1", None, "trigger must be an object"),
+        ],
+    )
+    async def it_reports_invalid_triggers_as_failed_results(
+        respx_mock, sample_trigger_response_bytes, trigger, rule_id, message
+    ):
+        route = respx_mock.post("/remote-api/rules/ru_2/trigger").mock(
+            return_value=httpx.Response(
+                200, content=sample_trigger_response_bytes, headers=JSON_CT
+            )
+        )
+
+        result = await handle_trigger_rules_batch(
+            {"triggers": [trigger, {"rule_id": "ru_2", "api_secret": "secret_2"}]}
+        )
+        data = parse_result(result)
+
+        assert data["results"][0] == {"rule_id": rule_id, "success": False, "message": message}
+        assert data["results"][1]["success"] is True
+        assert route.call_count == 1
+        assert "secret_1" not in result[0].text
+
+    async def it_reports_a_result_for_each_rule(
+        respx_mock, sample_trigger_response_bytes, sample_error_response_invalid_secret_bytes
+    ):
+        first = respx_mock.post("/remote-api/rules/ru_1/trigger").mock(
+            return_value=httpx.Response(
+                200, content=sample_trigger_response_bytes, headers=JSON_CT
+            )
+        )
+        respx_mock.post("/remote-api/rules/ru_2/trigger").mock(
+            return_value=httpx.Response(
+                401, content=sample_error_response_invalid_secret_bytes, headers=JSON_CT
+            )
+        )
+        respx_mock.post("/remote-api/rules/ru_3/trigger").mock(
+            side_effect=httpx.ConnectError("Connection refused")
+        )
+
+        result = await call_tool(
+            "trigger_rules_batch",
+            {
+                "triggers": [
+                    {"rule_id": "ru_1", "api_secret": "secret_1", "payload": {"amount": 5}},
+                    {"rule_id": "ru_2", "api_secret": "wrong"},
+                    {"rule_id": "ru_3", "api_secret": "secret_3"},
+                ]
+            },
+        )
+        data = parse_result(result)
+
+        assert data["total_succeeded"] == 1
+        assert data["total_failed"] == 2
+        assert data["results"][0] == {
+            "rule_id": "ru_1",
+            "success": True,
+            "code": "OK",
+            "message": "Rule with id ru_12345 has been triggered",
+            "request_id": "b28f1d9e-8c2a-4d3e-9af1-XXXXXXXXXXXX",
+        }
+        assert data["results"][1]["success"] is False
+        assert data["results"][1]["code"] == "INVALID_API_SECRET"
+        assert data["results"][1]["status_code"] == 401
+        assert data["results"][2]["success"] is False
+        assert "Connection refused" in data["results"][2]["message"]
+        assert orjson.loads(first.calls[0].request.content) == {"amount": 5}
+
+
 def describe_get_access_token():
     """Tests for the get_access_token helper function."""
 
-    def it_returns_token_when_set():
-        original_token = os.environ.get("SEQUENCE_ACCESS_TOKEN")
-        os.environ["SEQUENCE_ACCESS_TOKEN"] = "test_token_value"
+    def it_returns_token_when_set(monkeypatch):
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "test_token_value")
 
-        try:
-            token = get_access_token()
-            assert token == "test_token_value"
-        finally:
-            if original_token:
-                os.environ["SEQUENCE_ACCESS_TOKEN"] = original_token
-            else:
-                del os.environ["SEQUENCE_ACCESS_TOKEN"]
+        load_access_token()
+        token = get_access_token()
+        assert token == "test_token_value"
 
-    def it_returns_none_when_not_set():
-        original_token = os.environ.get("SEQUENCE_ACCESS_TOKEN")
-        if "SEQUENCE_ACCESS_TOKEN" in os.environ:
-            del os.environ["SEQUENCE_ACCESS_TOKEN"]
+    def it_keeps_the_token_loaded_at_startup(monkeypatch):
+        monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "startup_token")
+        load_access_token()
+        monkeypatch.delenv("SEQUENCE_ACCESS_TOKEN")
 
-        try:
-            token = get_access_token()
-            assert token is None
-        finally:
-            if original_token:
-                os.environ["SEQUENCE_ACCESS_TOKEN"] = original_token
+        assert get_access_token() == "startup_token"
+
+    def it_returns_none_when_not_set(monkeypatch):
+        monkeypatch.delenv("SEQUENCE_ACCESS_TOKEN", raising=False)
+
+        load_access_token()
+        token = get_access_token()
+        assert token is None
+
+
+def describe_shared_http_client():
+    """Tests for the HTTP client shared across tool calls."""
+
+    async def it_reuses_the_same_client():
+        assert get_http_client() is get_http_client()
+
+    async def it_uses_the_client_default_pool_limits():
+        with patch.object(
+            SequenceClient, "create_http_client", wraps=SequenceClient.create_http_client
+        ) as create_http_client:
+            get_http_client()
+
+        create_http_client.assert_called_once_with()
+
+    async def it_closes_and_recreates_the_client():
+        client = get_http_client()
+        await close_http_client()
+        assert client.is_closed
+        assert get_http_client() is not client
+
+    async def it_handles_close_when_client_was_never_created():
+        await close_http_client()
+        await close_http_client()
 
 
 def describe_main():
     """Tests for the main server function."""
 
-    @pytest.mark.asyncio
+    @pytest.fixture(autouse=True)
+    async def restore_task_factory():
+        """Undo the eager task factory main() installs on the loop every test shares."""
+        loop = asyncio.get_running_loop()
+        previous = loop.get_task_factory()
+        yield
+        loop.set_task_factory(previous)
+
     async def it_runs_server_with_access_token_set(monkeypatch):
         """When SEQUENCE_ACCESS_TOKEN is set, main logs it and runs the server."""
         monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "test_token_12345")
 
-        # Create mock streams
-        mock_read_stream = AsyncMock()
-        mock_write_stream = AsyncMock()
+        # Mock stdio_server to return stand-in streams
+        mock_read_stream = MagicMock()
+        mock_write_stream = MagicMock()
+        mock_context_manager = _FakeCM((mock_read_stream, mock_write_stream))
 
-        # Mock stdio_server to return our mock streams
-        mock_context_manager = AsyncMock()
-        mock_context_manager.__aenter__.return_value = (
-            mock_read_stream,
-            mock_write_stream,
-        )
-        mock_context_manager.__aexit__.return_value = None
-
-        # Mock the server.run to complete immediately
+        # Record the server.run call and complete immediately
         from sequence_mcp import server
 
-        mock_server_run = AsyncMock()
-        monkeypatch.setattr(server.server, "run", mock_server_run)
+        called = []
 
-        with patch("sequence_mcp.server.stdio_server", return_value=mock_context_manager):
-            await main()
+        async def fake_run(*args, **kwargs):
+            called.append((args, kwargs))
+
+        monkeypatch.setattr(server.server, "run", fake_run)
+
+        monkeypatch.setattr(server, "stdio_server", lambda: mock_context_manager)
+        await main()
 
         # Verify server.run was called with the mock streams
-        mock_server_run.assert_called_once()
-        call_args = mock_server_run.call_args
-        assert call_args[0][0] == mock_read_stream
-        assert call_args[0][1] == mock_write_stream
+        assert len(called) == 1
+        assert called[0][0][:2] == (mock_read_stream, mock_write_stream)
+        assert get_access_token() == "test_token_12345"
 
-    @pytest.mark.asyncio
     async def it_runs_server_without_access_token(monkeypatch):
         """When SEQUENCE_ACCESS_TOKEN is not set, main logs a warning but still runs."""
-        if "SEQUENCE_ACCESS_TOKEN" in os.environ:
-            monkeypatch.delenv("SEQUENCE_ACCESS_TOKEN")
+        monkeypatch.delenv("SEQUENCE_ACCESS_TOKEN", raising=False)
 
-        mock_read_stream = AsyncMock()
-        mock_write_stream = AsyncMock()
-
-        mock_context_manager = AsyncMock()
-        mock_context_manager.__aenter__.return_value = (
-            mock_read_stream,
-            mock_write_stream,
-        )
-        mock_context_manager.__aexit__.return_value = None
+        mock_context_manager = _FakeCM((MagicMock(), MagicMock()))
 
         from sequence_mcp import server
 
-        mock_server_run = AsyncMock()
-        monkeypatch.setattr(server.server, "run", mock_server_run)
+        called = []
 
-        with patch("sequence_mcp.server.stdio_server", return_value=mock_context_manager):
-            await main()
+        async def fake_run(*args, **kwargs):
+            called.append((args, kwargs))
+
+        monkeypatch.setattr(server.server, "run", fake_run)
+
+        monkeypatch.setattr(server, "stdio_server", lambda: mock_context_manager)
+        await main()
 
         # Server should still run even without token
-        mock_server_run.assert_called_once()
+        assert len(called) == 1
 
-    @pytest.mark.asyncio
     async def it_propagates_server_errors(monkeypatch):
         """When the MCP server raises an exception, main propagates it."""
         monkeypatch.setenv("SEQUENCE_ACCESS_TOKEN", "test_token")
 
-        mock_context_manager = AsyncMock()
-        mock_context_manager.__aenter__.side_effect = RuntimeError("Server connection failed")
+        mock_context_manager = _FakeCM(RuntimeError("Server connection failed"))
 
-        with patch("sequence_mcp.server.stdio_server", return_value=mock_context_manager):
-            with pytest.raises(RuntimeError, match="Server connection failed"):
-                await main()
-
-
-def describe_main_entry_point():
-    """Tests for the __main__ entry point behavior.
-
-    The __main__ block (lines 230-239) handles:
-    1. Running asyncio.run(main())
-    2. Catching KeyboardInterrupt for graceful shutdown
-    3. Catching other exceptions and exiting with code 1
-    """
-
-    def it_runs_main_via_asyncio_run(monkeypatch):
-        """When the module runs as __main__, it calls asyncio.run(main())."""
-        import asyncio
-        import runpy
-        import warnings
-
-        # Track that asyncio.run was called
-        run_called = []
-
-        def mock_asyncio_run(coro):
-            run_called.append(coro)
-            # Close the coroutine to avoid "never awaited" warnings
-            coro.close()
-            # Raise SystemExit to stop execution
-            raise SystemExit(0)
-
-        monkeypatch.setattr(asyncio, "run", mock_asyncio_run)
-
-        # Suppress the runpy warning about module already in sys.modules
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=RuntimeWarning)
-            # Run the module as __main__
-            try:
-                runpy.run_module("sequence_mcp.server", run_name="__main__")
-            except SystemExit:
-                pass  # Expected - we raised it in mock
-
-        assert len(run_called) == 1  # asyncio.run was called once
-
-    def it_handles_keyboard_interrupt(monkeypatch, caplog):
-        """When KeyboardInterrupt occurs, the server logs and exits cleanly."""
-        import asyncio
-        import runpy
-        import logging
-        import warnings
-
-        def mock_asyncio_run(coro):
-            # Close the coroutine to avoid warnings
-            coro.close()
-            raise KeyboardInterrupt()
-
-        monkeypatch.setattr(asyncio, "run", mock_asyncio_run)
-
-        # Capture log messages and suppress runpy warnings
-        with caplog.at_level(logging.INFO):
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore", category=RuntimeWarning)
-                # Run the module - should handle KeyboardInterrupt gracefully
-                try:
-                    runpy.run_module("sequence_mcp.server", run_name="__main__")
-                except SystemExit:
-                    pass  # Not expected but acceptable
-
-        # The KeyboardInterrupt handler logs "Server stopped by user"
-        assert any(
-            "stopped by user" in record.message.lower()
-            for record in caplog.records
-        )
+        from sequence_mcp import server
 
-    def it_exits_with_code_1_on_fatal_error(monkeypatch, caplog):
-        """When a fatal error occurs, the server logs and exits with code 1."""
-        import asyncio
-        import runpy
-        import logging
-        import warnings
-
-        def mock_asyncio_run(coro):
-            # Close the coroutine to avoid warnings
-            coro.close()
-            raise RuntimeError("Simulated fatal error")
-
-        monkeypatch.setattr(asyncio, "run", mock_asyncio_run)
-
-        # Capture log messages and suppress runpy warnings
-        with caplog.at_level(logging.ERROR):
-            with warnings.catch_warnings():
-                warnings.filterwarnings("ignore", category=RuntimeWarning)
-                # Run the module - should catch the exception and exit with code 1
-                exit_code = None
-                try:
-                    runpy.run_module("sequence_mcp.server", run_name="__main__")
-                except SystemExit as e:
-                    exit_code = e.code
-
-        assert exit_code == 1
-
-        # The exception handler logs the error
-        assert any(
-            "Fatal error" in record.message or "Simulated fatal error" in record.message
-            for record in caplog.records
-        )
+        monkeypatch.setattr(server, "stdio_server", lambda: mock_context_manager)
+        with pytest.raises(RuntimeError, match="Server connection failed"):
+            await main()
@@ -0,0 +1,108 @@
+"""Tests for running the MCP server module as a script."""
+
+import sys
+
+import pytest
+
+from sequence_mcp import server
+from sequence_mcp.server import _cli_entrypoint, _run_cli
+
+
+async def _fake_main():
+    """Stands in for main(); the tests close it without running it."""
+
+
+def _closing(exc=None):
+    """A fake asyncio.run that closes the coroutine, then raises `exc` if given."""
+
+    def run(coro):
+        coro.close()
+        if exc is not None:
+            raise exc
+
+    return run
+
+
+def describe_run_cli():
+    """Tests for running the server and mapping how it stops to an exit code."""
+
+    def it_runs_main_via_the_runner():
+        run_called = []
+
+        def run(coro):
+            run_called.append(coro)
+            coro.close()
+
+        assert _run_cli(run=run, main_fn=_fake_main) == 0
+        assert len(run_called) == 1
+
+    def it_handles_keyboard_interrupt(caplog):
+        """When KeyboardInterrupt occurs, the server logs and exits cleanly."""
+        import logging
+
+        with caplog.at_level(logging.INFO, logger=server.logger.name):
+            exit_code = _run_cli(run=_closing(KeyboardInterrupt()), main_fn=_fake_main)
+
+        assert exit_code == 0
+        assert any("stopped by user" in record.message for record in caplog.records)
+
+    def it_returns_1_on_fatal_error(caplog):
+        """When a fatal error occurs, the server logs it and reports failure."""
+        import logging
+
+        with caplog.at_level(logging.ERROR, logger=server.logger.name):
+            exit_code = _run_cli(
+                run=_closing(RuntimeError("Simulated fatal error")), main_fn=_fake_main
+            )
+
+        assert exit_code == 1
+        assert any(
+            "Fatal error" in record.message or "Simulated fatal error" in record.message
+            for record in caplog.records
+        )
+
+
+def describe_cli_entrypoint():
+    """Tests for the command line entry point."""
+
+    @pytest.fixture
+    def policies(monkeypatch):
+        """Record event loop policies instead of installing them."""
+        import asyncio
+
+        installed = []
+        monkeypatch.setattr(asyncio, "set_event_loop_policy", installed.append)
+        return installed
+
+    def it_installs_uvloop_when_available(monkeypatch, policies):
+        """With uvloop importable, its event loop policy is installed first."""
+
+        class FakeUvloop:
+            class EventLoopPolicy:
+                pass
+
+        monkeypatch.setitem(sys.modules, "uvloop", FakeUvloop)
+        monkeypatch.setattr(server, "_run_cli", lambda: 0)
+
+        _cli_entrypoint()
+
+        assert len(policies) == 1
+        assert isinstance(policies[0], FakeUvloop.EventLoopPolicy)
+
+    def it_keeps_the_default_loop_without_uvloop(monkeypatch, policies):
+        """Without uvloop, the default event loop policy is left in place."""
+        # A None entry makes `import uvloop` raise ImportError
+        monkeypatch.setitem(sys.modules, "uvloop", None)
+        monkeypatch.setattr(server, "_run_cli", lambda: 0)
+
+        _cli_entrypoint()
+
+        assert policies == []
+
+    def it_exits_with_the_failure_code(monkeypatch, policies):
+        monkeypatch.setattr(server, "_run_cli", lambda: 1)
+
+        with pytest.raises(SystemExit) as exc_info:
+            _cli_entrypoint()
+
+        assert exc_info.value.code == 1